@@ -0,0 +1,103 @@
+"""Compare SQLite defaults with the embedded mode under concurrent refresh/me traffic.
+
+Run with ``python -m benchmarks.sqlite_embedded [--threads 8] [--iterations 50]``.
+Each thread owns one user and loops over ``/auth/refresh`` followed by ``/auth/me``,
+so commits from different threads contend for the database the way edge nodes do.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src import db
+from src.main import create_app
+
+MODES = {
+    "defaults": {"SQLITE_EMBEDDED_MODE": False},
+    "embedded": {"SQLITE_EMBEDDED_MODE": True},
+}
+
+
+def _run_mode(name: str, overrides: dict, threads: int, iterations: int, workdir: Path) -> dict:
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir / f'{name}.db'}",
+        "AUDIT_LOG_ENABLED": False,
+        "ADMISSION_CONTROL_ENABLED": False,
+        **overrides,
+    })
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    sessions = []
+    for index in range(threads):
+        data = client.post(
+            "/auth/register",
+            json={"email": f"bench{index}@example.com", "password": "BenchPass123"},
+        ).get_json()["data"]
+        sessions.append((data["access_token"], data["refresh_token"]))
+
+    def worker(session: tuple[str, str]) -> tuple[list[float], int]:
+        access_token, refresh_token = session
+        thread_client = app.test_client()
+        latencies, errors = [], 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            response = thread_client.post("/auth/refresh", json={"refresh_token": refresh_token})
+            if response.status_code != 200:
+                errors += 1
+                continue
+            data = response.get_json()["data"]
+            access_token, refresh_token = data["access_token"], data["refresh_token"]
+            me = thread_client.get(
+                "/auth/me", headers={"Authorization": f"Bearer {access_token}"}
+            )
+            errors += me.status_code != 200
+            latencies.append(time.perf_counter() - started)
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(worker, sessions))
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        db.engine.dispose()
+
+    latencies = sorted(latency for thread_latencies, _ in results for latency in thread_latencies)
+    return {
+        "mode": name,
+        "ops_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else float("nan"),
+        "errors": sum(errors for _, errors in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = [
+            _run_mode(name, overrides, args.threads, args.iterations, Path(workdir))
+            for name, overrides in MODES.items()
+        ]
+
+    print(f"{'mode':<10} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for row in rows:
+        print(
+            f"{row['mode']:<10} {row['ops_per_s']:>10.1f} {row['p50_ms']:>10.2f}"
+            f" {row['p99_ms']:>10.2f} {row['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,24 @@
+from typing import Any
+
+import sqlalchemy as sa
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+
+# Tables that live on the shard owning the user rather than on the default database.
+SHARDED_TABLES = frozenset({"users", "refresh_tokens"})
+
+
+class ShardRoutingSession(Session):
+    """Send sharded tables to the shard engine selected in ``info["shard_bind"]``."""
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, bind: Any = None, **kwargs: Any):
+        shard_bind = self.info.get("shard_bind")
+        if bind is None and shard_bind is not None and mapper is not None:
+            if sa.inspect(mapper).local_table.name in SHARDED_TABLES:
+                return shard_bind
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": ShardRoutingSession})
 
 __all__ = ["db"]
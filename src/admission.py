@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from flask import Flask, g, jsonify, request
+
+# Multiplicative decrease applied when a class runs slower than its target.
+DECREASE_FACTOR = 0.9
+LATENCY_SMOOTHING = 0.2
+# Seconds after which the smoothed latency of an idle class is no longer trusted.
+DEFAULT_LATENCY_WINDOW = 5.0
+
+
+@dataclass
+class RouteClass:
+    """A group of endpoints sharing a concurrency budget; lower ``priority`` is more important."""
+
+    name: str
+    priority: int
+    min_concurrency: int
+    max_concurrency: int
+    target_latency: float
+    endpoints: frozenset[str] = field(default_factory=frozenset)
+    limit: float = 0.0
+    in_flight: int = 0
+    latency: float = 0.0
+    sampled_at: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.limit = float(self.max_concurrency)
+
+    def congested(self, now: float, window: float) -> bool:
+        """Full, or busy and recently slower than target.
+
+        Latency only counts while the class has work in flight and its last
+        sample is younger than ``window``, so one slow request followed by an
+        idle period does not keep other classes shed.
+        """
+        if self.in_flight >= int(self.limit):
+            return True
+        return (
+            self.in_flight > 0
+            and now - self.sampled_at <= window
+            and self.latency > self.target_latency
+        )
+
+
+class AdmissionController:
+    """Bound concurrency per route class and shed lower-priority work first.
+
+    Each class has an AIMD limit between ``min_concurrency`` and
+    ``max_concurrency``: it grows by roughly one slot per window of completions
+    while the smoothed latency is under target, and shrinks multiplicatively
+    when it is over. While a more important class is congested, less important
+    classes are held to their minimum so that cheap session-preserving requests
+    keep their latency.
+    """
+
+    def __init__(
+        self,
+        classes: list[RouteClass],
+        latency_window: float = DEFAULT_LATENCY_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.classes = {route_class.name: route_class for route_class in classes}
+        self._by_endpoint = {
+            endpoint: route_class
+            for route_class in classes
+            for endpoint in route_class.endpoints
+        }
+        self.latency_window = latency_window
+        self._clock = clock
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def classify(self, endpoint: str | None) -> RouteClass | None:
+        return self._by_endpoint.get(endpoint) if endpoint else None
+
+    def try_acquire(self, route_class: RouteClass) -> bool:
+        with self._lock:
+            limit = int(route_class.limit)
+            now = self._clock()
+            if any(
+                other.priority < route_class.priority
+                and other.congested(now, self.latency_window)
+                for other in self.classes.values()
+            ):
+                limit = route_class.min_concurrency
+
+            if route_class.in_flight >= limit:
+                self.rejected += 1
+                return False
+            route_class.in_flight += 1
+            return True
+
+    def release(self, route_class: RouteClass, elapsed: float) -> None:
+        with self._lock:
+            route_class.in_flight -= 1
+            now = self._clock()
+            # A stale average says nothing about current load; restart from this sample.
+            if route_class.latency and now - route_class.sampled_at <= self.latency_window:
+                route_class.latency += LATENCY_SMOOTHING * (elapsed - route_class.latency)
+            else:
+                route_class.latency = elapsed
+            route_class.sampled_at = now
+
+            if route_class.latency > route_class.target_latency:
+                route_class.limit = max(
+                    float(route_class.min_concurrency), route_class.limit * DECREASE_FACTOR
+                )
+            else:
+                route_class.limit = min(
+                    float(route_class.max_concurrency), route_class.limit + 1 / route_class.limit
+                )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rejected": self.rejected,
+                "classes": {
+                    name: {
+                        "limit": int(route_class.limit),
+                        "in_flight": route_class.in_flight,
+                        "latency_ms": round(route_class.latency * 1000, 2),
+                    }
+                    for name, route_class in self.classes.items()
+                },
+            }
+
+
+def init_admission_control(app: Flask) -> AdmissionController | None:
+    if not app.config["ADMISSION_CONTROL_ENABLED"]:
+        return None
+
+    controller = AdmissionController(
+        [
+            RouteClass(
+                name=name,
+                priority=spec["priority"],
+                min_concurrency=spec["min_concurrency"],
+                max_concurrency=spec["max_concurrency"],
+                target_latency=spec["target_latency"],
+                endpoints=frozenset(spec["endpoints"]),
+            )
+            for name, spec in app.config["ADMISSION_ROUTE_CLASSES"].items()
+        ],
+        latency_window=app.config["ADMISSION_LATENCY_WINDOW"],
+    )
+    app.extensions["admission"] = controller
+    retry_after = str(app.config["ADMISSION_RETRY_AFTER"])
+
+    @app.before_request
+    def admit():
+        route_class = controller.classify(request.endpoint)
+        if route_class is None:
+            return None
+        if not controller.try_acquire(route_class):
+            response = jsonify(
+                {
+                    "success": False,
+                    "errors": {"service": "Service surchargé, réessayez plus tard."},
+                    "message": "Service temporairement indisponible.",
+                }
+            )
+            response.status_code = 503
+            response.headers["Retry-After"] = retry_after
+            return response
+        g.admission = (route_class, time.perf_counter())
+        return None
+
+    @app.teardown_request
+    def release(exc: BaseException | None) -> None:
+        admitted = g.pop("admission", None)
+        if admitted is not None:
+            route_class, started = admitted
+            controller.release(route_class, time.perf_counter() - started)
+
+    return controller
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from flask import Flask
+
+from src import db
+from src.models import AuthEvent
+
+logger = logging.getLogger(__name__)
+
+LOGIN_SUCCEEDED = "login_succeeded"
+LOGIN_FAILED = "login_failed"
+REFRESH_SUCCEEDED = "refresh_succeeded"
+REFRESH_FAILED = "refresh_failed"
+REFRESH_REUSE_DETECTED = "refresh_reuse_detected"
+LOGOUT = "logout"
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+
+class _FlushRequest:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class AuditLogWriter:
+    """Queue authentication events in memory and persist them in batches.
+
+    ``record`` only enqueues, so request handlers never wait on the database.
+    A daemon thread drains the bounded queue and writes a batch with one
+    multi-row insert whenever ``batch_size`` events are pending or
+    ``flush_interval`` seconds have passed. When the queue is full the event is
+    dropped (``drop``) or the caller waits up to ``block_timeout`` seconds
+    before dropping (``block``); drops are counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str = OVERFLOW_DROP,
+        block_timeout: float = 0.05,
+    ) -> None:
+        if overflow_policy not in {OVERFLOW_DROP, OVERFLOW_BLOCK}:
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy!r}")
+
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._queue: queue.Queue[dict[str, Any] | _FlushRequest | None] = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def record(
+        self,
+        event_type: str,
+        *,
+        user_id: int | None = None,
+        email: str | None = None,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> bool:
+        """Enqueue an event; return False if it was dropped."""
+        if self._closed:
+            return False
+        self._ensure_started()
+
+        event = {
+            "event_type": event_type,
+            "user_id": user_id,
+            "email": email,
+            "ip_address": ip_address,
+            "user_agent": user_agent[:255] if user_agent else None,
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until every event queued before this call has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain_inline()
+            return True
+
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch: list[dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = False
+
+            if isinstance(item, dict):
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            if batch:
+                self._write(batch)
+                batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is None:
+                return
+
+    def _drain_inline(self) -> None:
+        batch: list[dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, dict):
+                batch.append(item)
+            elif isinstance(item, _FlushRequest):
+                item.done.set()
+        for start in range(0, len(batch), self.batch_size):
+            self._write(batch[start : start + self.batch_size])
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(AuthEvent.__table__.insert(), batch)
+        except Exception:  # noqa: BLE001 - the writer thread must survive database errors
+            logger.exception("Failed to write %d audit events", len(batch))
+            with self._lock:
+                self.failed += len(batch)
+            return
+        with self._lock:
+            self.written += len(batch)
+
+
+def init_audit_log(app: Flask) -> AuditLogWriter | None:
+    if not app.config["AUDIT_LOG_ENABLED"]:
+        return None
+
+    writer = AuditLogWriter(
+        app,
+        max_queue_size=app.config["AUDIT_LOG_MAX_QUEUE_SIZE"],
+        batch_size=app.config["AUDIT_LOG_BATCH_SIZE"],
+        flush_interval=app.config["AUDIT_LOG_FLUSH_INTERVAL"],
+        overflow_policy=app.config["AUDIT_LOG_OVERFLOW_POLICY"],
+    )
+    app.extensions["audit_log"] = writer
+    atexit.register(writer.close)
+    return writer
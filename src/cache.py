@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe in-process LRU mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store ``value``; ``ttl`` overrides the cache-wide lifetime for this entry."""
+        with self._lock:
+            self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisTTLCache:
+    """String values shared by every worker through Redis, expiring after ``ttl`` seconds.
+
+    Exposes the ``get``/``set``/``pop`` subset of ``TTLCache``. Redis errors
+    read as misses so callers fall back to the database; a failed ``pop`` is
+    logged and leaves the entry to expire after ``ttl``.
+    """
+
+    def __init__(self, client: Any, ttl: float, prefix: str) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    def get(self, key: Hashable) -> str | None:
+        try:
+            value = self.client.get(self._key(key))
+        except Exception:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: Hashable, value: str) -> None:
+        try:
+            self.client.set(self._key(key), value, px=int(self.ttl * 1000))
+        except Exception:
+            pass
+
+    def pop(self, key: Hashable) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except Exception:
+            logger.warning("Failed to invalidate %s%s in Redis", self.prefix, key, exc_info=True)
+
+
+class _Flight(Generic[V]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[K, V]):
+    """Collapse concurrent calls sharing a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for and share its result (or exception). Nothing is kept once
+    the call returns, so later callers always run the function again.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, _Flight[V]] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: K, fn: Callable[[], V]) -> tuple[V, bool]:
+        """Return ``(result, shared)``; ``shared`` is true for callers that waited."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {"coalesced": self.coalesced, "in_flight": len(self._flights)}
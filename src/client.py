@@ -0,0 +1,90 @@
+"""Client helper for services authenticating with the client_credentials grant."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable
+
+Transport = Callable[[str, dict[str, Any]], tuple[int, dict[str, Any]]]
+
+
+class ServiceTokenError(RuntimeError):
+    """Raised when the auth service refuses to issue a service token."""
+
+
+def _urllib_transport(url: str, payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+class ServiceTokenClient:
+    """Fetch a service access token once and reuse it until shortly before it expires.
+
+    Thread-safe: concurrent callers share a single renewal request.
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: str | None = None,
+        *,
+        renew_before: float = 30.0,
+        transport: Transport = _urllib_transport,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.renew_before = renew_before
+        self._transport = transport
+        self._clock = clock
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self) -> str:
+        with self._lock:
+            if self._token is None or self._clock() >= self._expires_at - self.renew_before:
+                self._token, self._expires_at = self._fetch()
+            return self._token
+
+    def authorization_header(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.get_token()}"}
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after the API answered 401."""
+        with self._lock:
+            self._token = None
+
+    def _fetch(self) -> tuple[str, float]:
+        payload: dict[str, Any] = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        if self.scope is not None:
+            payload["scope"] = self.scope
+
+        requested_at = self._clock()
+        status, body = self._transport(self.token_url, payload)
+        if status != 200 or not body.get("success"):
+            raise ServiceTokenError(body.get("message") or f"Token request failed ({status})")
+
+        data = body["data"]
+        return data["access_token"], requested_at + float(data["expires_in"])
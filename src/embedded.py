@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Any
+
+import sqlalchemy as sa
+from flask import Flask
+from sqlalchemy import event
+
+from src import db
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def is_sqlite_file(uri: str | sa.engine.URL) -> bool:
+    url = sa.engine.make_url(uri)
+    return (
+        url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def _engine_options(app: Flask) -> dict[str, Any]:
+    return {
+        "pool_size": app.config["SQLITE_POOL_SIZE"],
+        "max_overflow": app.config["SQLITE_POOL_MAX_OVERFLOW"],
+    }
+
+
+def configure_pool_options(app: Flask) -> None:
+    """Size the pools of file-backed SQLite engines; call before ``db.init_app``."""
+    if not app.config["SQLITE_EMBEDDED_MODE"]:
+        return
+
+    if is_sqlite_file(app.config["SQLALCHEMY_DATABASE_URI"]):
+        options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+        for key, value in _engine_options(app).items():
+            options.setdefault(key, value)
+
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    for key, bind in binds.items():
+        if isinstance(bind, str) and is_sqlite_file(bind):
+            binds[key] = {"url": bind, **_engine_options(app)}
+
+
+def engine_options_for(app: Flask, uri: str) -> dict[str, Any]:
+    """Pool options for an engine the app creates itself (e.g. a shard), if embedded."""
+    if app.config["SQLITE_EMBEDDED_MODE"] and is_sqlite_file(uri):
+        return _engine_options(app)
+    return {}
+
+
+class SingleWriter:
+    """Serialize write transactions on one engine through an in-process lock.
+
+    A connection takes the lock at its first INSERT/UPDATE/DELETE and gives it
+    back on commit, rollback or check-in, so concurrent committers queue here
+    instead of spinning on SQLite's busy handler while readers carry on under WAL.
+    Waiting is bounded by ``timeout`` seconds (the ``busy_timeout`` pragma), after
+    which the statement fails with SQLite's own "database is locked" error.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def install(self, engine: sa.engine.Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "commit", self._commit)
+        event.listen(engine, "rollback", self._rollback)
+        event.listen(engine.pool, "checkin", self._release_record)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if conn.info.get("single_writer") or not statement.lstrip().upper().startswith(
+            WRITE_PREFIXES
+        ):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            # Events run outside SQLAlchemy's DBAPI error wrapping, so wrap it here
+            # to surface exactly what a busy plain SQLite connection would raise.
+            raise sa.exc.OperationalError(
+                statement, parameters, sqlite3.OperationalError("database is locked")
+            )
+        conn.info["single_writer"] = True
+
+    def _release(self, info: dict) -> None:
+        if info.pop("single_writer", False):
+            self._lock.release()
+
+    # The engine ``commit``/``rollback`` events fire *before* the DBAPI call, while
+    # SQLite still holds the write transaction. Finish it here first so the next
+    # writer never meets SQLite's busy handler; SQLAlchemy's own call that follows
+    # is then a no-op on a connection without an open transaction.
+    def _commit(self, conn) -> None:
+        self._finish(conn, "commit")
+
+    def _rollback(self, conn) -> None:
+        self._finish(conn, "rollback")
+
+    def _finish(self, conn, method: str) -> None:
+        if not conn.info.get("single_writer"):
+            return
+        try:
+            getattr(conn.connection.dbapi_connection, method)()
+        finally:
+            self._release(conn.info)
+
+    def _release_record(self, dbapi_connection, connection_record) -> None:
+        if connection_record is not None:
+            self._release(connection_record.info)
+
+
+def _pragma_listener(pragmas: dict[str, Any]):
+    def apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return apply_pragmas
+
+
+def init_embedded_sqlite(app: Flask) -> None:
+    """Apply connection pragmas and the single-writer queue to file-backed SQLite engines."""
+    if not app.config["SQLITE_EMBEDDED_MODE"]:
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    router = app.extensions.get("shard_router")
+    if router is not None:
+        engines.extend(router.engines.values())
+
+    pragmas = app.config["SQLITE_PRAGMAS"]
+    # SQLite's own default busy timeout is 0 ms; mirror that when the pragma is unset.
+    timeout = pragmas.get("busy_timeout", 0) / 1000
+    for engine in engines:
+        if not is_sqlite_file(engine.url):
+            continue
+        event.listen(engine, "connect", _pragma_listener(pragmas))
+        if app.config["SQLITE_SINGLE_WRITER"]:
+            SingleWriter(timeout).install(engine)
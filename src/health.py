@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src import db
+
+Probe = Callable[[Flask], dict[str, Any]]
+
+
+def _round_trip(engine: Engine) -> dict[str, Any]:
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def probe_database(app: Flask) -> dict[str, Any]:
+    """Run a trivial round trip against the primary database."""
+    return _round_trip(db.engine)
+
+
+def shard_probe(engine: Engine) -> Probe:
+    """Build a probe running the same round trip against one shard's engine."""
+    return lambda app: _round_trip(engine)
+
+
+def probe_pool(app: Flask) -> dict[str, Any]:
+    """Report connection pool usage; only queue-style pools expose saturation."""
+    pool = db.engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return {"ok": True, "pool": type(pool).__name__}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < app.config["READINESS_POOL_SATURATION_THRESHOLD"],
+        "pool": type(pool).__name__,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+    }
+
+
+def probe_redis(app: Flask) -> dict[str, Any]:
+    """Ping Redis when ``REDIS_URL`` is configured; report it as disabled otherwise."""
+    url = app.config.get("REDIS_URL")
+    if not url:
+        return {"ok": True, "status": "disabled"}
+
+    import redis  # Optional dependency, only needed when Redis is configured
+
+    started = time.perf_counter()
+    client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+    try:
+        client.ping()
+    finally:
+        client.close()
+    return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+class ReadinessProber:
+    """Refresh dependency probes on a background thread and serve the cached result.
+
+    The probe cost is bounded by ``interval`` no matter how often ``/ready`` is
+    polled. The thread is started lazily on first use so forked workers each get
+    their own prober.
+    """
+
+    def __init__(self, app: Flask, interval: float) -> None:
+        self.app = app
+        self.interval = interval
+        self.probes: dict[str, Probe] = {}
+        self._result: dict[str, Any] | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, probe: Probe) -> None:
+        self.probes[name] = probe
+
+    def run_probes(self) -> dict[str, Any]:
+        checks: dict[str, dict[str, Any]] = {}
+        with self.app.app_context():
+            for name, probe in self.probes.items():
+                try:
+                    checks[name] = probe(self.app)
+                except Exception as exc:  # noqa: BLE001 - any failure means "not ready"
+                    checks[name] = {"ok": False, "error": type(exc).__name__}
+
+        result = {
+            "ready": all(check["ok"] for check in checks.values()),
+            "checks": checks,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._result = result
+            self._checked_at = time.monotonic()
+        return result
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="readiness-prober", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_probes()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the latest cached result, probing synchronously only on first use."""
+        with self._lock:
+            result, checked_at = self._result, self._checked_at
+
+        if result is None:
+            result = self.run_probes()
+            checked_at = time.monotonic()
+        self.start()
+
+        # A result far older than the interval means the prober thread is stuck.
+        if time.monotonic() - checked_at > self.interval * 3:
+            return {**result, "ready": False, "stale": True}
+        return result
+
+
+def init_readiness(app: Flask) -> ReadinessProber:
+    prober = ReadinessProber(app, interval=app.config["READINESS_PROBE_INTERVAL"])
+    prober.register("database", probe_database)
+    prober.register("pool", probe_pool)
+    prober.register("redis", probe_redis)
+    router = app.extensions.get("shard_router")
+    if router is not None:
+        for name, engine in router.engines.items():
+            prober.register(f"shard:{name}", shard_probe(engine))
+    app.extensions["readiness"] = prober
+    return prober
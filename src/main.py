@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import timedelta
 from typing import Any, Mapping
@@ -7,6 +8,15 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
 from src import db
+from src.admission import init_admission_control
+from src.audit import init_audit_log
+from src.embedded import configure_pool_options, init_embedded_sqlite
+from src.export import export_command
+from src.health import init_readiness
+from src.service_clients import derive_client_secret_key, service_clients_cli
+from src.sharding import init_sharding
+from src.timing import init_server_timing
+from src.tracing import init_tracing
 
 
 def create_app(config: Mapping[str, Any] | None = None) -> Flask:
@@ -16,19 +26,113 @@ def create_app(config: Mapping[str, Any] | None = None) -> Flask:
     app.config.setdefault("JWT_SECRET_KEY", os.getenv("JWT_SECRET_KEY", "change-me"))
     app.config.setdefault("JWT_ACCESS_TOKEN_EXPIRES", timedelta(minutes=15))
     app.config.setdefault("JWT_REFRESH_TOKEN_EXPIRES", timedelta(days=7))
+    # Seconds during which a just-rotated refresh token replays its successor pair.
+    app.config.setdefault("REFRESH_TOKEN_REUSE_GRACE", 10)
+    app.config.setdefault("REFRESH_TOKEN_REUSE_CACHE_SIZE", 10_000)
+    app.config.setdefault("LOGIN_COALESCING_ENABLED", True)
+    # Upper bound on cross-worker staleness of /auth/me 304s when REDIS_URL is unset.
+    app.config.setdefault("AUTH_ME_ETAG_CACHE_TTL", 5)
+    app.config.setdefault("AUTH_ME_ETAG_CACHE_SIZE", 10_000)
+    app.config.setdefault("REDIS_URL", os.getenv("REDIS_URL"))
+    app.config.setdefault("READINESS_PROBE_INTERVAL", 5.0)
+    app.config.setdefault("READINESS_POOL_SATURATION_THRESHOLD", 0.9)
+    app.config.setdefault("INTERNAL_SERVICE_TOKEN", os.getenv("INTERNAL_SERVICE_TOKEN"))
+    app.config.setdefault("INTERNAL_LOOKUP_MAX_BATCH", 500)
+    app.config.setdefault("EXPORT_BATCH_SIZE", 1000)
+    app.config.setdefault("AUDIT_LOG_ENABLED", True)
+    app.config.setdefault("AUDIT_LOG_MAX_QUEUE_SIZE", 10_000)
+    app.config.setdefault("AUDIT_LOG_BATCH_SIZE", 200)
+    app.config.setdefault("AUDIT_LOG_FLUSH_INTERVAL", 1.0)
+    app.config.setdefault("AUDIT_LOG_OVERFLOW_POLICY", "drop")
+    app.config.setdefault("AUTH_SHARDS", json.loads(os.getenv("AUTH_SHARDS", "{}")))
+    app.config.setdefault("AUTH_SHARD_BUCKETS", 256)
+    app.config.setdefault("AUTH_SHARD_MAP_FILE", os.getenv("AUTH_SHARD_MAP_FILE"))
+    # Retry-After for requests hitting a bucket frozen by `flask shards rebalance`.
+    app.config.setdefault("AUTH_SHARD_RETRY_AFTER", 5)
+    app.config.setdefault("SERVICE_TOKEN_EXPIRES", timedelta(minutes=15))
+    app.config.setdefault("SQLITE_EMBEDDED_MODE", True)
+    app.config.setdefault("SQLITE_PRAGMAS", {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -32 * 1024,  # negative values are KiB
+        "temp_store": "MEMORY",
+    })
+    app.config.setdefault("SQLITE_POOL_SIZE", 8)
+    app.config.setdefault("SQLITE_POOL_MAX_OVERFLOW", 8)
+    app.config.setdefault("SQLITE_SINGLE_WRITER", True)
+    app.config.setdefault("SERVER_TIMING_ENABLED", os.getenv("SERVER_TIMING_ENABLED") == "1")
+    app.config.setdefault("TRACING_ENABLED", os.getenv("TRACING_ENABLED") == "1")
+    app.config.setdefault("TRACING_SAMPLE_RATE", float(os.getenv("TRACING_SAMPLE_RATE", "0.01")))
+    app.config.setdefault("TRACING_FILE_PATH", os.getenv("TRACING_FILE_PATH"))
+    app.config.setdefault(
+        "TRACING_EXPORTER", "file" if app.config["TRACING_FILE_PATH"] else "memory"
+    )
+    app.config.setdefault("TRACING_MEMORY_MAX_SPANS", 10_000)
+    app.config.setdefault("ADMISSION_CONTROL_ENABLED", True)
+    app.config.setdefault("ADMISSION_RETRY_AFTER", 1)
+    app.config.setdefault("ADMISSION_LATENCY_WINDOW", 5.0)
+    app.config.setdefault("ADMISSION_ROUTE_CLASSES", {
+        # Cheap requests that keep existing sessions alive are shed last.
+        "session": {
+            "priority": 0,
+            "endpoints": [
+                "auth.refresh",
+                "auth.me",
+                "auth.logout",
+                "auth.list_sessions",
+                "auth.revoke_session",
+            ],
+            "min_concurrency": 4,
+            "max_concurrency": 64,
+            "target_latency": 0.25,
+        },
+        # Password hashing dominates these.
+        "hashing": {
+            "priority": 1,
+            "endpoints": ["auth.register", "auth.login"],
+            "min_concurrency": 1,
+            "max_concurrency": 8,
+            "target_latency": 1.0,
+        },
+    })
 
     if config:
         app.config.update(config)
+    app.config.setdefault(
+        "SERVICE_CLIENT_SECRET_KEY",
+        os.getenv("SERVICE_CLIENT_SECRET_KEY")
+        or derive_client_secret_key(app.config["JWT_SECRET_KEY"]),
+    )
 
     CORS(app)
+    init_sharding(app)
+    configure_pool_options(app)
     db.init_app(app)
+    init_embedded_sqlite(app)
     JWTManager(app)
 
     # Ensure models are registered with SQLAlchemy metadata
     from src import models  # noqa: F401
     from src.routes.auth import auth_bp
+    from src.routes.internal import internal_bp
 
     app.register_blueprint(auth_bp)
+    app.register_blueprint(internal_bp)
+    app.cli.add_command(export_command)
+    app.cli.add_command(service_clients_cli)
+    init_audit_log(app)
+    init_tracing(app)
+    init_server_timing(app)
+    admission = init_admission_control(app)
+    readiness = init_readiness(app)
+    if admission is not None:
+        readiness.register("admission", lambda app: {"ok": True, **admission.snapshot()})
+    if app.config["LOGIN_COALESCING_ENABLED"]:
+        # Each coalesced login is one lookup and one password hash check saved.
+        login_flights = app.extensions["login_flights"]
+        readiness.register("login_coalescing", lambda app: {"ok": True, **login_flights.snapshot()})
 
     @app.get("/health")
     def health():
@@ -38,6 +142,21 @@ def create_app(config: Mapping[str, Any] | None = None) -> Flask:
             "message": "Service en bonne santé"
         }), 200
 
+    @app.get("/ready")
+    def ready():
+        snapshot = readiness.snapshot()
+        if snapshot["ready"]:
+            return jsonify({
+                "success": True,
+                "data": {"status": "ready", **snapshot},
+                "message": "Service prêt"
+            }), 200
+        return jsonify({
+            "success": False,
+            "data": {"status": "not_ready", **snapshot},
+            "message": "Service indisponible"
+        }), 503
+
     return app
 
 
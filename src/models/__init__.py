@@ -1,22 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Mapped
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from src import db
 
+# 64-bit ids so sharded deployments can embed the routing bucket in user ids;
+# SQLite only autoincrements a plain INTEGER primary key.
+BigId = db.BigInteger().with_variant(db.Integer, "sqlite")
+
 
 class User(db.Model):
     __tablename__ = "users"
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(BigId, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(
         db.DateTime(timezone=True), server_default=db.func.now(), nullable=False
     )
+    # Bumped by SQLAlchemy on every UPDATE of the row; feeds the /auth/me ETag.
+    version = db.Column(db.Integer, nullable=False)
+
+    __mapper_args__ = {"version_id_col": version}
 
     refresh_tokens: Mapped[list["RefreshToken"]] = db.relationship(
         "RefreshToken",
@@ -38,14 +47,36 @@ class User(db.Model):
 
 class RefreshToken(db.Model):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Covers the active-session listing so it can be served from the index alone.
+        db.Index(
+            "ix_refresh_tokens_active_user_created",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_include=["expires_at"],
+            postgresql_where=db.text("NOT revoked"),
+            sqlite_where=db.text("revoked = 0"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(BigId, db.ForeignKey("users.id"), nullable=False)
     token = db.Column(db.String(255), unique=True, nullable=False)
     revoked = db.Column(db.Boolean, default=False, nullable=False)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    # Tokens descending from the same login share a family, revoked together on reuse.
+    family_id = db.Column(
+        db.String(32), default=lambda: uuid.uuid4().hex, nullable=True, index=True
+    )
+    replaced_by_id = db.Column(db.Integer, nullable=True)
     expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    # Set client-side as well so keyset cursors round-trip with sub-second precision.
     created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now(), nullable=False
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=db.func.now(),
+        nullable=False,
     )
 
     user: Mapped[User] = db.relationship("User", back_populates="refresh_tokens", lazy="joined")
@@ -62,3 +93,49 @@ class RefreshToken(db.Model):
             reference_time = reference_time.replace(tzinfo=timezone.utc)
 
         return expires_at <= reference_time
+
+    def rotated_within(self, window: timedelta, reference_time: datetime | None = None) -> bool:
+        """Return True if the token was rotated less than ``window`` before the given time."""
+        if self.replaced_by_id is None or self.revoked_at is None:
+            return False
+
+        reference_time = reference_time or datetime.now(timezone.utc)
+
+        revoked_at = self.revoked_at
+        if revoked_at.tzinfo is None:
+            revoked_at = revoked_at.replace(tzinfo=timezone.utc)
+
+        if reference_time.tzinfo is None:
+            reference_time = reference_time.replace(tzinfo=timezone.utc)
+
+        return reference_time - revoked_at <= window
+
+
+class AuthEvent(db.Model):
+    __tablename__ = "auth_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(32), nullable=False)
+    # Plain column rather than a foreign key: audit rows outlive deleted users.
+    user_id = db.Column(BigId, nullable=True, index=True)
+    email = db.Column(db.String(255), nullable=True)
+    ip_address = db.Column(db.String(45), nullable=True)
+    user_agent = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+
+
+class ServiceClient(db.Model):
+    __tablename__ = "service_clients"
+
+    id = db.Column(db.Integer, primary_key=True)
+    client_id = db.Column(db.String(64), unique=True, nullable=False)
+    secret_hash = db.Column(db.String(64), nullable=False)
+    scopes = db.Column(db.String(255), nullable=False, default="")
+    active = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(
+        db.DateTime(timezone=True), server_default=db.func.now(), nullable=False
+    )
+
+    @property
+    def scope_set(self) -> frozenset[str]:
+        return frozenset(self.scopes.split())
@@ -1,5 +1,6 @@
 """Application routes package."""
 
 from .auth import auth_bp
+from .internal import internal_bp
 
-__all__ = ["auth_bp"]
+__all__ = ["auth_bp", "internal_bp"]
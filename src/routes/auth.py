@@ -1,30 +1,138 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import hmac
+import json
 import re
+import secrets
 from datetime import datetime, timedelta, timezone
+from functools import wraps
 
-from flask import Blueprint, current_app, jsonify, request
+from flask import Blueprint, current_app, has_app_context, jsonify, request
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
     get_jwt_identity,
     jwt_required,
 )
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession, object_session
 
-from src import db
+from src import audit, db, sharding, timing
+from src.cache import RedisTTLCache, SingleFlight, TTLCache
 from src.models import RefreshToken, User
+from src.service_clients import authenticate_service_client
 
 EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+ME_CACHE_CONTROL = "private, no-cache"
+SESSIONS_DEFAULT_LIMIT = 20
+SESSIONS_MAX_LIMIT = 100
+# Per-process key for login coalescing; flight keys never leave this worker.
+_LOGIN_FLIGHT_KEY = secrets.token_bytes(32)
 
 
 auth_bp = Blueprint("auth", __name__)
 
 
+def _build_etag_cache(app) -> TTLCache[int, str] | RedisTTLCache:
+    """Share ETags through Redis when configured; otherwise keep them per process.
+
+    A per-process cache only sees invalidations made by its own worker, so other
+    workers may answer 304 for up to ``AUTH_ME_ETAG_CACHE_TTL`` after a change.
+    """
+    url = app.config.get("REDIS_URL")
+    if url:
+        import redis  # Optional dependency, only needed when Redis is configured
+
+        return RedisTTLCache(
+            redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5),
+            ttl=app.config["AUTH_ME_ETAG_CACHE_TTL"],
+            prefix="auth:me:etag:",
+        )
+    return TTLCache(
+        ttl=app.config["AUTH_ME_ETAG_CACHE_TTL"],
+        maxsize=app.config["AUTH_ME_ETAG_CACHE_SIZE"],
+    )
+
+
+@auth_bp.record_once
+def _init_caches(state) -> None:
+    app = state.app
+    app.extensions["auth_me_etags"] = _build_etag_cache(app)
+    # Successor token pairs keyed by the refresh token they replaced.
+    app.extensions["refresh_grace"] = TTLCache(
+        ttl=app.config["REFRESH_TOKEN_REUSE_GRACE"],
+        maxsize=app.config["REFRESH_TOKEN_REUSE_CACHE_SIZE"],
+    )
+    # In-flight credential checks shared by identical concurrent logins.
+    app.extensions["login_flights"] = SingleFlight()
+
+
+def _etag_cache() -> TTLCache[int, str] | RedisTTLCache | None:
+    return current_app.extensions.get("auth_me_etags")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_etag_stale(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault("stale_user_etags", set()).add(target.id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _forget_stale_user_etags(session: OrmSession) -> None:
+    # Dropped only once the change is visible: clearing at flush time let a
+    # concurrent /auth/me re-cache the old ETag before the commit landed.
+    stale = session.info.pop("stale_user_etags", None)
+    if not stale or not has_app_context():
+        return
+    cache = _etag_cache()
+    if cache is not None:
+        for user_id in stale:
+            cache.pop(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_stale_user_etags(session: OrmSession) -> None:
+    session.info.pop("stale_user_etags", None)
+
+
+def _audit(event_type: str, *, user_id: int | None = None, email: str | None = None) -> None:
+    writer = current_app.extensions.get("audit_log")
+    if writer is not None:
+        writer.record(
+            event_type,
+            user_id=user_id,
+            email=email,
+            ip_address=request.remote_addr,
+            user_agent=request.user_agent.string or None,
+        )
+
+
+def _user_etag(user: User) -> str:
+    digest = hashlib.blake2b(
+        f"{user.id}:{user.version}:{user.email}".encode(), digest_size=8
+    ).hexdigest()
+    return f"{user.id}-{user.version}-{digest}"
+
+
 def _normalize_email(email: str) -> str:
     return email.strip().lower()
 
 
+def _json_payload() -> dict:
+    with timing.phase("parse"):
+        return request.get_json(silent=True) or {}
+
+
+def _jsonify(*args, **kwargs):
+    with timing.phase("serialize"):
+        return jsonify(*args, **kwargs)
+
+
 def _validate_input(data: dict[str, object]) -> tuple[dict[str, str], str | None, str | None]:
     email = data.get("email")
     password = data.get("password")
@@ -69,21 +177,23 @@ def _resolve_refresh_token_expiry(now: datetime) -> datetime:
 
 @auth_bp.post("/auth/register")
 def register():
-    payload = request.get_json(silent=True) or {}
-    errors, email, password = _validate_input(payload)
+    payload = _json_payload()
+    with timing.phase("validate"):
+        errors, email, password = _validate_input(payload)
 
     if errors:
         return (
-            jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
+            _jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
             400,
         )
 
     assert email is not None and password is not None  # For type checkers
 
+    bucket = sharding.route_email(email)
     existing_user = db.session.execute(db.select(User).filter_by(email=email)).scalar_one_or_none()
     if existing_user is not None:
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
                     "errors": {"email": "Un utilisateur avec cet email existe déjà."},
@@ -93,8 +203,9 @@ def register():
             409,
         )
 
-    user = User(email=email)
-    user.set_password(password)
+    user = User(id=sharding.user_id_for_new_user(bucket), email=email)
+    with timing.phase("hash"):
+        user.set_password(password)
 
     db.session.add(user)
 
@@ -103,7 +214,7 @@ def register():
     except IntegrityError:
         db.session.rollback()
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
                     "errors": {"email": "Un utilisateur avec cet email existe déjà."},
@@ -113,8 +224,9 @@ def register():
             409,
         )
 
-    access_token = create_access_token(identity=str(user.id))
-    refresh_token = create_refresh_token(identity=str(user.id))
+    with timing.phase("jwt"):
+        access_token = create_access_token(identity=str(user.id))
+        refresh_token = create_refresh_token(identity=str(user.id))
 
     now = datetime.now(timezone.utc)
     refresh_token_entry = RefreshToken(
@@ -127,7 +239,7 @@ def register():
     db.session.commit()
 
     return (
-        jsonify(
+        _jsonify(
             {
                 "success": True,
                 "data": {
@@ -142,24 +254,49 @@ def register():
     )
 
 
+def _login_flights() -> SingleFlight[str, tuple[int | None, bool]]:
+    return current_app.extensions["login_flights"]
+
+
+def _login_flight_key(email: str, password: str) -> str:
+    message = email.encode() + b"\0" + password.encode()
+    return hmac.new(_LOGIN_FLIGHT_KEY, message, hashlib.sha256).hexdigest()
+
+
+def _check_credentials(email: str, password: str) -> tuple[int | None, bool]:
+    """Look up ``email`` and verify ``password``; returns ``(user_id, valid)``."""
+    user = db.session.execute(db.select(User).filter_by(email=email)).scalar_one_or_none()
+    with timing.phase("hash"):
+        valid = user is not None and user.check_password(password)
+    return (user.id if user is not None else None), valid
+
+
 @auth_bp.post("/auth/login")
 def login():
-    payload = request.get_json(silent=True) or {}
-    errors, email, password = _validate_input(payload)
+    payload = _json_payload()
+    with timing.phase("validate"):
+        errors, email, password = _validate_input(payload)
 
     if errors:
         return (
-            jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
+            _jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
             400,
         )
 
     assert email is not None and password is not None  # For type checkers
 
-    user = db.session.execute(db.select(User).filter_by(email=email)).scalar_one_or_none()
+    sharding.route_email(email)
+    if current_app.config["LOGIN_COALESCING_ENABLED"]:
+        (user_id, valid_credentials), _ = _login_flights().do(
+            _login_flight_key(email, password), lambda: _check_credentials(email, password)
+        )
+    else:
+        user_id, valid_credentials = _check_credentials(email, password)
 
-    if user is None or not user.check_password(password):
+    if not valid_credentials:
+        _audit(audit.LOGIN_FAILED, user_id=user_id, email=email)
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
                     "errors": {
@@ -171,24 +308,26 @@ def login():
             401,
         )
 
-    access_token = create_access_token(identity=str(user.id))
-    refresh_token = create_refresh_token(identity=str(user.id))
+    with timing.phase("jwt"):
+        access_token = create_access_token(identity=str(user_id))
+        refresh_token = create_refresh_token(identity=str(user_id))
 
     now = datetime.now(timezone.utc)
     refresh_token_entry = RefreshToken(
-        user=user,
+        user_id=user_id,
         token=refresh_token,
         expires_at=_resolve_refresh_token_expiry(now),
     )
     db.session.add(refresh_token_entry)
     db.session.commit()
+    _audit(audit.LOGIN_SUCCEEDED, user_id=user_id, email=email)
 
     return (
-        jsonify(
+        _jsonify(
             {
                 "success": True,
                 "data": {
-                    "user": {"id": user.id, "email": user.email},
+                    "user": {"id": user_id, "email": email},
                     "access_token": access_token,
                     "refresh_token": refresh_token,
                 },
@@ -199,14 +338,117 @@ def login():
     )
 
 
+def _refresh_grace_cache() -> TTLCache[str, dict]:
+    return current_app.extensions["refresh_grace"]
+
+
+def _refresh_succeeded(data: dict):
+    return (
+        _jsonify(
+            {
+                "success": True,
+                "data": data,
+                "message": "Token renouvelé avec succès.",
+            }
+        ),
+        200,
+    )
+
+
+def _refresh_token_rejected():
+    return (
+        _jsonify(
+            {
+                "success": False,
+                "errors": {
+                    "refresh_token": "Refresh token invalide ou expiré.",
+                },
+                "message": "Token de rafraîchissement invalide.",
+            }
+        ),
+        401,
+    )
+
+
+def _rotate_refresh_token(stored_token: RefreshToken, now: datetime) -> dict | None:
+    """Revoke ``stored_token`` and issue its successor, or return None if another request won."""
+    user = stored_token.user
+    with timing.phase("jwt"):
+        access_token = create_access_token(identity=str(user.id))
+        new_refresh_token = create_refresh_token(identity=str(user.id))
+
+    successor = RefreshToken(
+        user=user,
+        token=new_refresh_token,
+        family_id=stored_token.family_id,
+        expires_at=_resolve_refresh_token_expiry(now),
+    )
+    db.session.add(successor)
+    db.session.flush()
+
+    # Conditional update so exactly one concurrent request performs the rotation.
+    claimed = db.session.execute(
+        db.update(RefreshToken)
+        .where(RefreshToken.id == stored_token.id, db.not_(RefreshToken.revoked))
+        .values(revoked=True, revoked_at=now, replaced_by_id=successor.id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.session.rollback()
+        return None
+
+    db.session.commit()
+    return {
+        "user": {"id": user.id, "email": user.email},
+        "access_token": access_token,
+        "refresh_token": new_refresh_token,
+    }
+
+
+def _replay_rotation(
+    stored_token: RefreshToken, presented_token: str, now: datetime, grace: timedelta
+) -> dict | None:
+    """Return the successor pair of a token rotated within the grace window, if still valid."""
+    successor = db.session.get(RefreshToken, stored_token.replaced_by_id)
+    if successor is None or successor.revoked or successor.is_expired(now):
+        return None
+
+    cache = _refresh_grace_cache()
+    data = cache.get(presented_token)
+    if data is None:
+        # Rotated by another worker: reissue an access token alongside the same successor.
+        user = successor.user
+        with timing.phase("jwt"):
+            access_token = create_access_token(identity=str(user.id))
+        data = {
+            "user": {"id": user.id, "email": user.email},
+            "access_token": access_token,
+            "refresh_token": successor.token,
+        }
+        cache.set(presented_token, data, ttl=grace.total_seconds())
+    return data
+
+
+def _revoke_token_family(stored_token: RefreshToken, now: datetime) -> None:
+    if stored_token.family_id is None:
+        return
+    db.session.execute(
+        db.update(RefreshToken)
+        .where(RefreshToken.family_id == stored_token.family_id, db.not_(RefreshToken.revoked))
+        .values(revoked=True, revoked_at=now)
+        .execution_options(synchronize_session="fetch")
+    )
+    db.session.commit()
+
+
 @auth_bp.post("/auth/refresh")
 def refresh():
-    payload = request.get_json(silent=True) or {}
+    payload = _json_payload()
     refresh_token = payload.get("refresh_token")
 
     if not isinstance(refresh_token, str) or not refresh_token.strip():
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
                     "errors": {"refresh_token": "Refresh token requis."},
@@ -217,90 +459,202 @@ def refresh():
         )
 
     normalized_token = refresh_token.strip()
-    stored_token = db.session.execute(
-        db.select(RefreshToken).filter_by(token=normalized_token)
-    ).scalar_one_or_none()
+    stored_token = None
+    if sharding.route_refresh_token(normalized_token):
+        stored_token = db.session.execute(
+            db.select(RefreshToken).filter_by(token=normalized_token)
+        ).scalar_one_or_none()
+
+    now = datetime.now(timezone.utc)
+    # Read once so the replay cache and the database check agree on the window.
+    grace = timedelta(seconds=current_app.config["REFRESH_TOKEN_REUSE_GRACE"])
+    if stored_token is not None and not stored_token.revoked and not stored_token.is_expired(now):
+        data = _rotate_refresh_token(stored_token, now)
+        if data is not None:
+            _refresh_grace_cache().set(normalized_token, data, ttl=grace.total_seconds())
+            _audit(audit.REFRESH_SUCCEEDED, user_id=data["user"]["id"])
+            return _refresh_succeeded(data)
+        # Another request rotated this token first; fall through to the replay check.
+
+    # Only rotated tokens can be replayed or reused; tokens revoked by logout or
+    # session revocation are plain failures.
+    if stored_token is not None and stored_token.revoked and stored_token.replaced_by_id:
+        if stored_token.rotated_within(grace, now):
+            data = _replay_rotation(stored_token, normalized_token, now, grace)
+            if data is not None:
+                _audit(audit.REFRESH_SUCCEEDED, user_id=data["user"]["id"])
+                return _refresh_succeeded(data)
+        else:
+            _revoke_token_family(stored_token, now)
+            _audit(audit.REFRESH_REUSE_DETECTED, user_id=stored_token.user_id)
+            return _refresh_token_rejected()
+
+    _audit(audit.REFRESH_FAILED, user_id=stored_token.user_id if stored_token else None)
+    return _refresh_token_rejected()
 
-    if (
-        stored_token is None
-        or stored_token.revoked
-        or stored_token.is_expired(datetime.now(timezone.utc))
-    ):
+
+@auth_bp.post("/auth/logout")
+def logout():
+    payload = _json_payload()
+    refresh_token = payload.get("refresh_token")
+
+    if not isinstance(refresh_token, str) or not refresh_token.strip():
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
-                    "errors": {
-                        "refresh_token": "Refresh token invalide ou expiré.",
-                    },
-                    "message": "Token de rafraîchissement invalide.",
+                    "errors": {"refresh_token": "Refresh token requis."},
+                    "message": "Données invalides.",
                 }
             ),
-            401,
+            400,
         )
 
-    user = stored_token.user
-    access_token = create_access_token(identity=str(user.id))
+    normalized_token = refresh_token.strip()
+    stored_token = None
+    if sharding.route_refresh_token(normalized_token):
+        stored_token = db.session.execute(
+            db.select(RefreshToken).filter_by(token=normalized_token)
+        ).scalar_one_or_none()
 
-    now = datetime.now(timezone.utc)
-    stored_token.revoked = True
-    new_refresh_token = create_refresh_token(identity=str(user.id))
-    new_refresh_entry = RefreshToken(
-        user=user,
-        token=new_refresh_token,
-        expires_at=_resolve_refresh_token_expiry(now),
-    )
-    db.session.add(new_refresh_entry)
-    db.session.commit()
+    if stored_token is not None and not stored_token.revoked:
+        stored_token.revoked = True
+        stored_token.revoked_at = datetime.now(timezone.utc)
+        db.session.commit()
+    _audit(audit.LOGOUT, user_id=stored_token.user_id if stored_token else None)
 
     return (
-        jsonify(
+        _jsonify(
             {
                 "success": True,
-                "data": {
-                    "user": {"id": user.id, "email": user.email},
-                    "access_token": access_token,
-                    "refresh_token": new_refresh_token,
-                },
-                "message": "Token renouvelé avec succès.",
+                "data": {"revoked": True},
+                "message": "Déconnexion effectuée.",
             }
         ),
         200,
     )
 
 
-@auth_bp.post("/auth/logout")
-def logout():
-    payload = request.get_json(silent=True) or {}
-    refresh_token = payload.get("refresh_token")
+def _current_user_id() -> int | None:
+    identity = get_jwt_identity()
 
-    if not isinstance(refresh_token, str) or not refresh_token.strip():
+    if isinstance(identity, int):
+        return identity
+    try:
+        return int(identity)
+    except (TypeError, ValueError):
+        return None
+
+
+def user_jwt_required(view):
+    """``jwt_required`` for user endpoints: service tokens (``sub="client:…"``) are refused."""
+
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if _current_user_id() is None:
+            return (
+                _jsonify(
+                    {
+                        "success": False,
+                        "errors": {"token": "Jeton utilisateur requis."},
+                        "message": "Accès refusé.",
+                    }
+                ),
+                403,
+            )
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _not_modified(etag: str):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = ME_CACHE_CONTROL
+    response.vary.add("Authorization")
+    return response
+
+
+@auth_bp.post("/auth/token")
+def token():
+    payload = _json_payload() or request.form
+    grant_type = payload.get("grant_type")
+
+    if grant_type != "client_credentials":
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
-                    "errors": {"refresh_token": "Refresh token requis."},
+                    "errors": {"grant_type": "Type d'autorisation non supporté."},
                     "message": "Données invalides.",
                 }
             ),
             400,
         )
 
-    normalized_token = refresh_token.strip()
-    stored_token = db.session.execute(
-        db.select(RefreshToken).filter_by(token=normalized_token)
-    ).scalar_one_or_none()
+    # Credentials may come from HTTP Basic auth or from the request body.
+    basic = request.authorization
+    if basic is not None and basic.type == "basic":
+        client_id, client_secret = basic.username, basic.password
+    else:
+        client_id, client_secret = payload.get("client_id"), payload.get("client_secret")
 
-    if stored_token is not None and not stored_token.revoked:
-        stored_token.revoked = True
-        db.session.commit()
+    client = None
+    if isinstance(client_id, str) and isinstance(client_secret, str):
+        client = authenticate_service_client(client_id, client_secret)
+
+    if client is None:
+        return (
+            _jsonify(
+                {
+                    "success": False,
+                    "errors": {"client": "Client invalide."},
+                    "message": "Identifiants client invalides.",
+                }
+            ),
+            401,
+        )
+
+    requested_scope = payload.get("scope")
+    if isinstance(requested_scope, str) and not requested_scope.strip():
+        requested_scope = None  # An empty scope means the same as an absent one.
+    if requested_scope is None:
+        scopes = client.scope_set
+    elif isinstance(requested_scope, str) and set(requested_scope.split()) <= client.scope_set:
+        scopes = frozenset(requested_scope.split())
+    else:
+        return (
+            _jsonify(
+                {
+                    "success": False,
+                    "errors": {"scope": "Portée non autorisée pour ce client."},
+                    "message": "Données invalides.",
+                }
+            ),
+            400,
+        )
+
+    expires_delta: timedelta = current_app.config["SERVICE_TOKEN_EXPIRES"]
+    scope = " ".join(sorted(scopes))
+    with timing.phase("jwt"):
+        access_token = create_access_token(
+            identity=f"client:{client.client_id}",
+            expires_delta=expires_delta,
+            additional_claims={"client_id": client.client_id, "scope": scope},
+        )
 
     return (
-        jsonify(
+        _jsonify(
             {
                 "success": True,
-                "data": {"revoked": True},
-                "message": "Déconnexion effectuée.",
+                "data": {
+                    "access_token": access_token,
+                    "token_type": "Bearer",
+                    "expires_in": int(expires_delta.total_seconds()),
+                    "scope": scope,
+                },
+                "message": "Jeton de service émis.",
             }
         ),
         200,
@@ -308,22 +662,25 @@ def logout():
 
 
 @auth_bp.get("/auth/me")
-@jwt_required()
+@user_jwt_required
 def me():
-    identity = get_jwt_identity()
+    user_id = _current_user_id()
+    cache = _etag_cache()
+
+    # Revalidation fast path: answer from the cached ETag without touching the database.
+    if user_id is not None and cache is not None and request.if_none_match:
+        cached_etag = cache.get(user_id)
+        if cached_etag is not None and request.if_none_match.contains_weak(cached_etag):
+            return _not_modified(cached_etag)
 
     user = None
-    if isinstance(identity, int):
-        user = db.session.get(User, identity)
-    else:
-        try:
-            user = db.session.get(User, int(identity))
-        except (TypeError, ValueError):
-            user = None
+    if user_id is not None:
+        sharding.route_user_id(user_id)
+        user = db.session.get(User, user_id)
 
     if user is None:
         return (
-            jsonify(
+            _jsonify(
                 {
                     "success": False,
                     "errors": {"user": "Utilisateur introuvable."},
@@ -333,12 +690,144 @@ def me():
             404,
         )
 
+    etag = _user_etag(user)
+    if cache is not None:
+        cache.set(user.id, etag)
+
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+
+    response = _jsonify(
+        {
+            "success": True,
+            "data": {"user": {"id": user.id, "email": user.email}},
+            "message": "Profil utilisateur récupéré.",
+        }
+    )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = ME_CACHE_CONTROL
+    response.vary.add("Authorization")
+    return response, 200
+
+
+def _encode_session_cursor(created_at: datetime, token_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), token_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_session_cursor(cursor: str) -> tuple[datetime, int] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, token_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(token_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def _serialize_session(created_at: datetime, expires_at: datetime, token_id: int) -> dict:
+    return {
+        "id": token_id,
+        "created_at": created_at.isoformat(),
+        "expires_at": expires_at.isoformat(),
+    }
+
+
+@auth_bp.get("/auth/sessions")
+@user_jwt_required
+def list_sessions():
+    user_id = _current_user_id()
+    if user_id is not None:
+        sharding.route_user_id(user_id)
+    limit = request.args.get("limit", SESSIONS_DEFAULT_LIMIT, type=int)
+    cursor = request.args.get("cursor")
+
+    errors: dict[str, str] = {}
+    if not 1 <= limit <= SESSIONS_MAX_LIMIT:
+        errors["limit"] = f"La limite doit être comprise entre 1 et {SESSIONS_MAX_LIMIT}."
+
+    position = None
+    if cursor:
+        position = _decode_session_cursor(cursor)
+        if position is None:
+            errors["cursor"] = "Curseur invalide."
+
+    if errors:
+        return (
+            _jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
+            400,
+        )
+
+    # Only indexed columns are selected so the partial index can answer alone;
+    # the user's revoked history is never read.
+    statement = (
+        db.select(RefreshToken.created_at, RefreshToken.expires_at, RefreshToken.id)
+        .where(
+            RefreshToken.user_id == user_id,
+            db.not_(RefreshToken.revoked),
+            RefreshToken.expires_at > datetime.now(timezone.utc),
+        )
+        .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+        .limit(limit + 1)
+    )
+    if position is not None:
+        statement = statement.where(
+            db.tuple_(RefreshToken.created_at, RefreshToken.id) < position
+        )
+
+    rows = db.session.execute(statement).all()
+    page = rows[:limit]
+    next_cursor = (
+        _encode_session_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    )
+
     return (
-        jsonify(
+        _jsonify(
             {
                 "success": True,
-                "data": {"user": {"id": user.id, "email": user.email}},
-                "message": "Profil utilisateur récupéré.",
+                "data": {
+                    "sessions": [_serialize_session(*row) for row in page],
+                    "next_cursor": next_cursor,
+                },
+                "message": "Sessions actives récupérées.",
+            }
+        ),
+        200,
+    )
+
+
+@auth_bp.delete("/auth/sessions/<int:session_id>")
+@user_jwt_required
+def revoke_session(session_id: int):
+    user_id = _current_user_id()
+    if user_id is not None:
+        sharding.route_user_id(user_id)
+    stored_token = db.session.execute(
+        db.select(RefreshToken).filter_by(id=session_id, user_id=user_id)
+    ).scalar_one_or_none()
+
+    if stored_token is None:
+        return (
+            _jsonify(
+                {
+                    "success": False,
+                    "errors": {"session": "Session introuvable."},
+                    "message": "Session introuvable.",
+                }
+            ),
+            404,
+        )
+
+    if not stored_token.revoked:
+        stored_token.revoked = True
+        stored_token.revoked_at = datetime.now(timezone.utc)
+        db.session.commit()
+
+    return (
+        _jsonify(
+            {
+                "success": True,
+                "data": {"revoked": True},
+                "message": "Session révoquée.",
             }
         ),
         200,
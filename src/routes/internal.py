@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hmac
+from functools import wraps
+from typing import Any, Callable
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+from src import db, sharding
+from src.export import EXPORT_COLUMNS, iter_ndjson, shard_error
+from src.models import User
+from src.routes.auth import _normalize_email
+
+LOOKUP_FIELDS = {
+    "id": User.id,
+    "email": User.email,
+    "created_at": User.created_at,
+}
+DEFAULT_LOOKUP_FIELDS = ("id", "email")
+
+
+internal_bp = Blueprint("internal", __name__)
+
+
+def _invalid(errors: dict[str, str]):
+    return (
+        jsonify({"success": False, "errors": errors, "message": "Données invalides."}),
+        400,
+    )
+
+
+def _has_service_scope(scope: str) -> bool:
+    if request.headers.get("Authorization", "").startswith("Bearer "):
+        verify_jwt_in_request()
+        claims = get_jwt()
+        return "client_id" in claims and scope in claims.get("scope", "").split()
+
+    expected = current_app.config.get("INTERNAL_SERVICE_TOKEN")
+    presented = request.headers.get("X-Service-Token", "")
+    return bool(expected) and hmac.compare_digest(presented, expected)
+
+
+def service_required(scope: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Require a client_credentials token carrying ``scope`` or the shared ``X-Service-Token``."""
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any):
+            if not _has_service_scope(scope):
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "errors": {"service": "Authentification de service requise."},
+                            "message": "Accès refusé.",
+                        }
+                    ),
+                    401,
+                )
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _in_id_range(value: int) -> bool:
+    # users.id is a signed 64-bit column; larger values overflow in the driver.
+    return -(2**63) <= value < 2**63
+
+
+@internal_bp.post("/internal/users/lookup")
+@service_required("users:read")
+def lookup_users():
+    payload = request.get_json(silent=True) or {}
+    ids = payload.get("ids")
+    emails = payload.get("emails")
+    fields = payload.get("fields") or list(DEFAULT_LOOKUP_FIELDS)
+    max_batch = current_app.config["INTERNAL_LOOKUP_MAX_BATCH"]
+
+    if (ids is None) == (emails is None):
+        return _invalid({"ids": "Fournir soit des ids, soit des emails."})
+
+    keys, keys_field = (ids, "ids") if ids is not None else (emails, "emails")
+    if not isinstance(keys, list) or not keys:
+        return _invalid({keys_field: "Liste non vide requise."})
+    if len(keys) > max_batch:
+        return _invalid({keys_field: f"Au plus {max_batch} éléments par requête."})
+
+    if ids is not None:
+        if not all(
+            isinstance(value, int) and not isinstance(value, bool) and _in_id_range(value)
+            for value in ids
+        ):
+            return _invalid({"ids": "Les ids doivent être des entiers 64 bits."})
+        key_field, key_column, lookup_keys = "id", User.id, list(dict.fromkeys(ids))
+    else:
+        if not all(isinstance(value, str) for value in emails):
+            return _invalid({"emails": "Les emails doivent être des chaînes."})
+        lookup_keys = list(dict.fromkeys(_normalize_email(value) for value in emails))
+        key_field, key_column = "email", User.email
+
+    if (
+        not isinstance(fields, list)
+        or not fields
+        or not all(isinstance(name, str) and name in LOOKUP_FIELDS for name in fields)
+    ):
+        return _invalid({"fields": f"Champs autorisés : {', '.join(LOOKUP_FIELDS)}."})
+
+    # Select bare columns rather than User entities so no relationship is loaded.
+    selected = list(dict.fromkeys([key_field, *fields]))
+    groups = (
+        sharding.group_by_shard(user_ids=lookup_keys)
+        if key_field == "id"
+        else sharding.group_by_shard(emails=lookup_keys)
+    )
+    rows = []
+    for shard, shard_keys in groups.items():
+        sharding.use_shard(shard)
+        rows.extend(
+            db.session.execute(
+                db.select(*(LOOKUP_FIELDS[name] for name in selected)).where(
+                    key_column.in_(shard_keys)
+                )
+            ).all()
+        )
+
+    users = []
+    found = set()
+    for row in rows:
+        record = row._asdict()
+        found.add(record[key_field])
+        if "created_at" in record:
+            record["created_at"] = record["created_at"].isoformat()
+        users.append({name: record[name] for name in fields})
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "data": {
+                    "users": users,
+                    "missing": [key for key in lookup_keys if key not in found],
+                },
+                "message": "Utilisateurs récupérés.",
+            }
+        ),
+        200,
+    )
+
+
+@internal_bp.get("/internal/export/<table>")
+@service_required("users:export")
+def export_table(table: str):
+    if table not in EXPORT_COLUMNS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "errors": {"table": "Table inconnue."},
+                    "message": "Ressource introuvable.",
+                }
+            ),
+            404,
+        )
+
+    after = request.args.get("after")
+    shard = request.args.get("shard")
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+
+    if after is not None:
+        try:
+            after = int(after)
+        except ValueError:
+            return _invalid({"after": "Curseur invalide."})
+
+    error = shard_error(shard)
+    if error is not None:
+        return _invalid({"shard": error})
+
+    # No Content-Length is set, so the WSGI server streams with chunked encoding.
+    return Response(
+        stream_with_context(
+            iter_ndjson(table, after=after, batch_size=batch_size, shard=shard)
+        ),
+        mimetype="application/x-ndjson",
+    )
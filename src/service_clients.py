@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from src import db
+from src.models import ServiceClient
+
+
+SECRET_KEY_LABEL = b"umbra-auth service-client-secret v1"
+
+
+def derive_client_secret_key(jwt_secret_key: str) -> str:
+    """Domain-separated default for ``SERVICE_CLIENT_SECRET_KEY``.
+
+    Used when no dedicated key is configured, so the token-signing key is never
+    used directly as the HMAC key for client secrets.
+    """
+    return hmac.new(jwt_secret_key.encode(), SECRET_KEY_LABEL, hashlib.sha256).hexdigest()
+
+
+def hash_client_secret(secret: str) -> str:
+    """Keyed HMAC-SHA256 of a client secret.
+
+    Client secrets are generated with 256 bits of entropy, so unlike user
+    passwords they need no slow KDF; the server-side key keeps a leaked
+    ``service_clients`` table from being usable on its own.
+    """
+    key = current_app.config["SERVICE_CLIENT_SECRET_KEY"].encode()
+    return hmac.new(key, secret.encode(), hashlib.sha256).hexdigest()
+
+
+def create_service_client(client_id: str, scopes: list[str]) -> tuple[ServiceClient, str]:
+    """Register a client and return it with its plain secret, which is not stored."""
+    secret = secrets.token_urlsafe(32)
+    client = ServiceClient(
+        client_id=client_id,
+        secret_hash=hash_client_secret(secret),
+        scopes=" ".join(sorted(set(scopes))),
+    )
+    db.session.add(client)
+    db.session.commit()
+    return client, secret
+
+
+def authenticate_service_client(client_id: str, secret: str) -> ServiceClient | None:
+    client = db.session.execute(
+        db.select(ServiceClient).filter_by(client_id=client_id)
+    ).scalar_one_or_none()
+
+    # Hash even for unknown clients so response timing does not reveal which exist.
+    presented = hash_client_secret(secret)
+    if client is None or not client.active:
+        return None
+    if not hmac.compare_digest(presented, client.secret_hash):
+        return None
+    return client
+
+
+service_clients_cli = AppGroup("service-clients", help="Manage service clients.")
+
+
+@service_clients_cli.command("create")
+@click.argument("client_id")
+@click.option("--scope", "scopes", multiple=True, help="Scope granted to the client.")
+def create_command(client_id: str, scopes: tuple[str, ...]) -> None:
+    """Register CLIENT_ID and print its secret once."""
+    _, secret = create_service_client(client_id, list(scopes))
+    click.echo(f"client_id={client_id}")
+    click.echo(f"client_secret={secret}")
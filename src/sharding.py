@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Any
+
+import click
+import sqlalchemy as sa
+from flask import Flask, current_app, jsonify
+from flask.cli import AppGroup
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+
+from src import SHARDED_TABLES, db
+from src.embedded import engine_options_for
+
+# User ids stay below 2**53 so JavaScript clients can represent them exactly.
+MAX_USER_ID = 2**53
+MAP_RELOAD_INTERVAL = 1.0
+# Time given to other workers to pick up a map change and to in-flight requests to finish.
+MOVE_SETTLE_SECONDS = 3 * MAP_RELOAD_INTERVAL
+
+
+class BucketMovingError(RuntimeError):
+    """The bucket owning the request is frozen while :func:`move_bucket` copies it."""
+
+
+def bucket_for_email(normalized_email: str, bucket_count: int) -> int:
+    """Map a normalized email to a bucket with a hash that is stable across processes."""
+    digest = hashlib.blake2b(normalized_email.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % bucket_count
+
+
+class ShardRouter:
+    """Route users and their refresh tokens to shards through a fixed set of buckets.
+
+    An email hashes to one of ``bucket_count`` buckets and user ids are minted
+    so that ``id % bucket_count`` is that bucket; any request carrying either
+    the email or the user id (e.g. a token's ``sub``) is routed without a
+    scatter-gather. Buckets map to shards round-robin unless reassigned by
+    :func:`move_bucket`, whose assignments and frozen buckets are persisted to
+    ``map_file`` and picked up by other workers when the file changes.
+    """
+
+    def __init__(
+        self,
+        engines: dict[str, sa.engine.Engine],
+        bucket_count: int,
+        map_file: str | None = None,
+    ) -> None:
+        if not engines:
+            raise ValueError("At least one shard is required")
+        self.engines = engines
+        self.shards = sorted(engines)
+        self.bucket_count = bucket_count
+        self.map_file = map_file
+        self._overrides: dict[int, str] = {}
+        self._frozen: set[int] = set()
+        self._map_mtime: float | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load_map()
+
+    def bucket_for_email(self, normalized_email: str) -> int:
+        return bucket_for_email(normalized_email, self.bucket_count)
+
+    def bucket_for_user_id(self, user_id: int) -> int:
+        return user_id % self.bucket_count
+
+    def shard_for_bucket(self, bucket: int) -> str:
+        self._maybe_reload_map()
+        return self._overrides.get(bucket) or self.shards[bucket % len(self.shards)]
+
+    def shard_for_email(self, normalized_email: str) -> str:
+        return self.shard_for_bucket(self.bucket_for_email(normalized_email))
+
+    def shard_for_user_id(self, user_id: int) -> str:
+        return self.shard_for_bucket(self.bucket_for_user_id(user_id))
+
+    def is_frozen(self, bucket: int) -> bool:
+        self._maybe_reload_map()
+        return bucket in self._frozen
+
+    def new_user_id(self, bucket: int) -> int:
+        high = secrets.randbelow(MAX_USER_ID // self.bucket_count - 1) + 1
+        return high * self.bucket_count + bucket
+
+    def freeze(self, bucket: int) -> None:
+        """Reject requests routed to ``bucket`` until it is assigned or thawed."""
+        with self._lock:
+            self._frozen.add(bucket)
+        self._save_map()
+
+    def thaw(self, bucket: int) -> None:
+        with self._lock:
+            self._frozen.discard(bucket)
+        self._save_map()
+
+    def assign(self, bucket: int, shard: str) -> None:
+        """Route ``bucket`` to ``shard`` and lift any freeze on it."""
+        if shard not in self.shards:
+            raise ValueError(f"Unknown shard: {shard!r}")
+        with self._lock:
+            self._overrides[bucket] = shard
+            self._frozen.discard(bucket)
+        self._save_map()
+
+    def _save_map(self) -> None:
+        with self._lock:
+            overrides, frozen = dict(self._overrides), set(self._frozen)
+        if self.map_file:
+            self._write_map(overrides, frozen)
+
+    def _load_map(self) -> None:
+        if not self.map_file or not os.path.exists(self.map_file):
+            return
+        with open(self.map_file, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if "assignments" not in data:  # Maps written before buckets could be frozen
+            data = {"assignments": data, "frozen": []}
+        overrides = {int(bucket): shard for bucket, shard in data["assignments"].items()}
+        with self._lock:
+            self._overrides = overrides
+            self._frozen = set(data["frozen"])
+            self._map_mtime = os.path.getmtime(self.map_file)
+
+    def _maybe_reload_map(self) -> None:
+        if not self.map_file:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < MAP_RELOAD_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.map_file)
+        except OSError:
+            return
+        if mtime != self._map_mtime:
+            self._load_map()
+
+    def _write_map(self, overrides: dict[int, str], frozen: set[int]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.map_file))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, encoding="utf-8"
+        ) as handle:
+            json.dump(
+                {
+                    "assignments": {
+                        str(bucket): shard for bucket, shard in sorted(overrides.items())
+                    },
+                    "frozen": sorted(frozen),
+                },
+                handle,
+            )
+        os.replace(handle.name, self.map_file)
+        with self._lock:
+            self._map_mtime = os.path.getmtime(self.map_file)
+
+
+def get_router() -> ShardRouter | None:
+    return current_app.extensions.get("shard_router")
+
+
+def use_shard(shard: str | None) -> None:
+    """Send sharded tables of the current session to ``shard`` (None: default database)."""
+    db.session.info["shard_bind"] = get_router().engines[shard] if shard else None
+
+
+def _use_bucket(router: ShardRouter, bucket: int) -> None:
+    if router.is_frozen(bucket):
+        raise BucketMovingError(bucket)
+    use_shard(router.shard_for_bucket(bucket))
+
+
+def route_email(normalized_email: str) -> int | None:
+    """Select the shard owning ``normalized_email`` and return its bucket, if sharded."""
+    router = get_router()
+    if router is None:
+        return None
+    bucket = router.bucket_for_email(normalized_email)
+    _use_bucket(router, bucket)
+    return bucket
+
+
+def route_user_id(user_id: int) -> None:
+    router = get_router()
+    if router is not None:
+        _use_bucket(router, router.bucket_for_user_id(user_id))
+
+
+def route_refresh_token(token: str) -> bool:
+    """Select the shard from the token's ``sub``; return False if it cannot be routed."""
+    router = get_router()
+    if router is None:
+        return True
+    try:
+        user_id = int(decode_token(token, allow_expired=True)["sub"])
+    except (PyJWTError, JWTExtendedException, KeyError, TypeError, ValueError):
+        return False
+    _use_bucket(router, router.bucket_for_user_id(user_id))
+    return True
+
+
+def group_by_shard(user_ids: list[int] = (), emails: list[str] = ()) -> dict[str | None, list]:
+    """Partition lookup keys by owning shard; everything maps to ``None`` when unsharded."""
+    router = get_router()
+    if router is None:
+        return {None: [*user_ids, *emails]}
+
+    groups: dict[str | None, list] = {}
+    for user_id in user_ids:
+        groups.setdefault(router.shard_for_user_id(user_id), []).append(user_id)
+    for email in emails:
+        groups.setdefault(router.shard_for_email(email), []).append(email)
+    return groups
+
+
+def user_id_for_new_user(bucket: int | None) -> int | None:
+    router = get_router()
+    if router is None or bucket is None:
+        return None
+    return router.new_user_id(bucket)
+
+
+def _sharded_tables() -> list[sa.Table]:
+    return [db.metadata.tables[name] for name in sorted(SHARDED_TABLES)]
+
+
+def create_shard_schemas() -> None:
+    router = get_router()
+    if router is None:
+        return
+    for shard in router.shards:
+        db.metadata.create_all(router.engines[shard], tables=_sharded_tables())
+
+
+def _copy_missing_rows(router: ShardRouter, bucket: int, source: str, target: str) -> int:
+    """Bring ``target`` up to date with the bucket's rows on ``source``; return users inserted.
+
+    Missing users and tokens are inserted. Rows already on the target are
+    reconciled too, since a straggler write may have updated them on the source
+    after an earlier pass: users take the source row when its ``version`` is
+    newer, and source revocations are applied to the target's tokens so a
+    logout is never undone by the purge.
+    """
+    users = db.metadata.tables["users"]
+    tokens = db.metadata.tables["refresh_tokens"]
+    in_users = users.c.id % router.bucket_count == bucket
+    in_tokens = tokens.c.user_id % router.bucket_count == bucket
+
+    with router.engines[target].connect() as connection:
+        present_users = dict(
+            connection.execute(sa.select(users.c.id, users.c.version).where(in_users)).all()
+        )
+        present_tokens = dict(
+            connection.execute(sa.select(tokens.c.token, tokens.c.revoked).where(in_tokens)).all()
+        )
+
+    user_rows, updated_users, token_rows, revoked_tokens = [], [], [], []
+    with router.engines[source].connect() as connection:
+        for row in connection.execute(sa.select(users).where(in_users)).mappings():
+            if row["id"] not in present_users:
+                user_rows.append(dict(row))
+            elif row["version"] > present_users[row["id"]]:
+                updated_users.append(dict(row))
+        for row in connection.execute(sa.select(tokens).where(in_tokens)).mappings():
+            if row["token"] not in present_tokens:
+                # Token ids are shard-local, so the target assigns new ones and
+                # rotation links to the old ids are dropped.
+                token_rows.append(
+                    {
+                        **{key: value for key, value in row.items() if key != "id"},
+                        "replaced_by_id": None,
+                    }
+                )
+            elif row["revoked"] and not present_tokens[row["token"]]:
+                revoked_tokens.append(row)
+
+    with router.engines[target].begin() as connection:
+        if user_rows:
+            connection.execute(users.insert(), user_rows)
+        for row in updated_users:
+            connection.execute(users.update().where(users.c.id == row["id"]).values(**row))
+        if token_rows:
+            connection.execute(tokens.insert(), token_rows)
+        for row in revoked_tokens:
+            connection.execute(
+                tokens.update()
+                .where(tokens.c.token == row["token"])
+                .values(revoked=True, revoked_at=row["revoked_at"])
+            )
+    return len(user_rows)
+
+
+def move_bucket(bucket: int, target: str, settle: float = MOVE_SETTLE_SECONDS) -> int:
+    """Move a bucket's users and tokens to ``target`` behind a write fence.
+
+    The bucket is frozen in the shared map first, so every worker rejects its
+    requests with 503 while it moves; ``settle`` seconds are left for workers to
+    see the freeze and for in-flight requests to finish. After the copy the
+    bucket is rerouted (which lifts the freeze), rows that still reached the
+    source are copied again, and only then is the source purged. Requires
+    ``AUTH_SHARD_MAP_FILE``: without a shared map other workers would keep
+    writing to the source. Returns the number of users moved.
+    """
+    router = get_router()
+    if router is None:
+        raise RuntimeError("Sharding is not configured")
+    if not router.map_file:
+        raise RuntimeError("Moving buckets requires AUTH_SHARD_MAP_FILE shared by all workers")
+    source = router.shard_for_bucket(bucket)
+    if source == target:
+        return 0
+
+    router.freeze(bucket)
+    try:
+        time.sleep(settle)
+        moved = _copy_missing_rows(router, bucket, source, target)
+    except BaseException:
+        router.thaw(bucket)
+        raise
+
+    router.assign(bucket, target)
+    time.sleep(settle)
+    moved += _copy_missing_rows(router, bucket, source, target)
+
+    users = db.metadata.tables["users"]
+    tokens = db.metadata.tables["refresh_tokens"]
+    with router.engines[source].begin() as connection:
+        connection.execute(tokens.delete().where(tokens.c.user_id % router.bucket_count == bucket))
+        connection.execute(users.delete().where(users.c.id % router.bucket_count == bucket))
+
+    return moved
+
+
+shards_cli = AppGroup("shards", help="Manage user shards.")
+
+
+@shards_cli.command("create-schema")
+def create_schema_command() -> None:
+    """Create the users and refresh_tokens tables on every shard."""
+    create_shard_schemas()
+
+
+@shards_cli.command("rebalance")
+@click.option("--bucket", "buckets", type=int, multiple=True, required=True)
+@click.option("--to", "target", required=True, help="Destination shard.")
+@click.option(
+    "--settle",
+    type=float,
+    default=MOVE_SETTLE_SECONDS,
+    show_default=True,
+    help="Seconds to wait for workers to see each map change.",
+)
+def rebalance_command(buckets: tuple[int, ...], target: str, settle: float) -> None:
+    """Move BUCKETs and their users to another shard."""
+    for bucket in buckets:
+        moved = move_bucket(bucket, target, settle=settle)
+        click.echo(f"bucket {bucket}: {moved} users -> {target}")
+
+
+def init_sharding(app: Flask) -> ShardRouter | None:
+    """Create an engine per configured shard.
+
+    Shards are deliberately not Flask-SQLAlchemy binds: binds register global
+    metadata per key, which would leak into every other app in the process.
+    """
+    shards: dict[str, Any] = app.config["AUTH_SHARDS"]
+    app.cli.add_command(shards_cli)
+    if not shards:
+        return None
+
+    router = ShardRouter(
+        {
+            name: sa.create_engine(uri, **engine_options_for(app, uri))
+            for name, uri in shards.items()
+        },
+        bucket_count=app.config["AUTH_SHARD_BUCKETS"],
+        map_file=app.config["AUTH_SHARD_MAP_FILE"],
+    )
+    app.extensions["shard_router"] = router
+    retry_after = str(app.config["AUTH_SHARD_RETRY_AFTER"])
+
+    @app.errorhandler(BucketMovingError)
+    def bucket_moving(exc: BucketMovingError):
+        response = jsonify(
+            {
+                "success": False,
+                "errors": {"service": "Compte en cours de migration, réessayez plus tard."},
+                "message": "Service temporairement indisponible.",
+            }
+        )
+        response.status_code = 503
+        response.headers["Retry-After"] = retry_after
+        return response
+
+    return router
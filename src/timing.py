@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import Any, ContextManager
+
+from flask import Flask, Response, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_NOOP = contextlib.nullcontext()
+# Flipped once any app enables Server-Timing or tracing, so disabled
+# deployments skip even the ``g`` lookup.
+_enabled = False
+_traced = False
+_engine_hooks_installed = False
+
+
+class RequestTimings:
+    """Accumulated duration and count per phase for the current request."""
+
+    __slots__ = ("phases", "started")
+
+    def __init__(self) -> None:
+        self.phases: dict[str, list[float]] = {}
+        self.started = time.perf_counter()
+
+    def add(self, name: str, elapsed: float) -> None:
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+
+    def header(self) -> str:
+        metrics = []
+        for name, (elapsed, count) in self.phases.items():
+            metric = f"{name};dur={elapsed * 1000:.2f}"
+            if name == "db":
+                metric += f';desc="{int(count)} queries"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+class _Phase:
+    __slots__ = ("timings", "trace", "name", "started", "span")
+
+    def __init__(self, timings: RequestTimings | None, trace: Any, name: str) -> None:
+        self.timings = timings
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        if self.trace is not None:
+            self.span = self.trace.start_span(self.name)
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.started)
+        if self.trace is not None:
+            self.trace.end_span(self.span)
+
+
+def _current() -> RequestTimings | None:
+    if not _enabled or not has_app_context():
+        return None
+    return g.get("server_timing")
+
+
+def enable_phase_tracing() -> None:
+    """Let ``phase`` also open a span on the request's sampled trace (``g.trace``)."""
+    global _traced
+    _traced = True
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Time a block as ``name`` for Server-Timing and tracing; a no-op when both are off."""
+    if not (_enabled or _traced) or not has_app_context():
+        return _NOOP
+    timings = g.get("server_timing") if _enabled else None
+    trace = g.get("trace") if _traced else None
+    if timings is None and trace is None:
+        return _NOOP
+    return _Phase(timings, trace, name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current() is not None:
+        context.server_timing_started = time.perf_counter()
+
+
+def _record_statement(context) -> None:
+    started = getattr(context, "server_timing_started", None)
+    if started is None:
+        return
+    del context.server_timing_started
+    timings = _current()
+    if timings is not None:
+        timings.add("db", time.perf_counter() - started)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record_statement(context)
+
+
+def _handle_error(exception_context) -> None:
+    _record_statement(exception_context.execution_context)
+
+
+def init_server_timing(app: Flask) -> None:
+    global _enabled, _engine_hooks_installed
+
+    if not app.config["SERVER_TIMING_ENABLED"]:
+        return
+
+    _enabled = True
+    if not _engine_hooks_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _engine_hooks_installed = True
+
+    @app.before_request
+    def start_timing() -> None:
+        g.server_timing = RequestTimings()
+
+    @app.after_request
+    def add_server_timing(response: Response) -> Response:
+        timings = g.pop("server_timing", None)
+        if timings is not None:
+            response.headers["Server-Timing"] = timings.header()
+        return response
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+
+from flask import Flask, Response, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src import timing
+
+TRACEPARENT_REGEX = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+SAMPLED_FLAG = 0x01
+MAX_STATEMENT_LENGTH = 512
+
+_engine_hooks_installed = False
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a W3C ``traceparent`` header."""
+    if not header:
+        return None
+    match = TRACEPARENT_REGEX.match(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & SAMPLED_FLAG)
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_time_ns: int
+    end_time_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1_000_000
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class InMemorySpanExporter:
+    """Keep the most recent ``max_spans`` finished spans, for tests and local debugging."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """Append finished spans to ``path`` as JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(asdict(span), default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+class RequestTrace:
+    """Spans recorded for one sampled request; nesting follows the call stack."""
+
+    def __init__(self, trace_id: str, parent_id: str | None) -> None:
+        self.trace_id = trace_id
+        self.remote_parent_id = parent_id
+        self.spans: list[Span] = []
+        self._stack: list[Span] = []
+
+    @property
+    def current_span_id(self) -> str | None:
+        return self._stack[-1].span_id if self._stack else self.remote_parent_id
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Span:
+        span = Span(
+            trace_id=self.trace_id,
+            span_id=_new_span_id(),
+            parent_id=self.current_span_id,
+            name=name,
+            start_time_ns=time.time_ns(),
+            attributes=attributes or {},
+        )
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end_time_ns = time.time_ns()
+        if self._stack and self._stack[-1] is span:
+            self._stack.pop()
+        elif span in self._stack:
+            self._stack.remove(span)
+
+
+class Tracer:
+    """Head-based sampler and exporter for request traces.
+
+    The sampling decision is taken once per request: an incoming sampled
+    ``traceparent`` is honoured, otherwise a fraction ``sample_rate`` of root
+    requests is recorded. Unsampled requests keep their trace id for
+    propagation but record nothing.
+    """
+
+    def __init__(self, exporter: SpanExporter, sample_rate: float) -> None:
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def should_sample(self, parent: tuple[str, str, bool] | None) -> bool:
+        if parent is not None:
+            return parent[2]
+        return random.random() < self.sample_rate
+
+
+def current_trace() -> RequestTrace | None:
+    if not has_app_context():
+        return None
+    return g.get("trace")
+
+
+def current_traceparent() -> str | None:
+    """Header value to propagate the current trace to an outgoing call."""
+    if not has_app_context() or "trace_id" not in g:
+        return None
+    trace = g.get("trace")
+    span_id = trace.current_span_id if trace is not None else g.trace_parent_id
+    return format_traceparent(g.trace_id, span_id or _new_span_id(), trace is not None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    trace = current_trace()
+    if trace is not None and context is not None:
+        # Kept on the execution context, which dies with the statement, rather than
+        # on the pooled connection.
+        context.trace_span = trace.start_span(
+            "db.query",
+            {
+                "db.system": conn.dialect.name,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+
+
+def _end_statement_span(context, **attributes: Any) -> None:
+    span = getattr(context, "trace_span", None)
+    if span is None:
+        return
+    del context.trace_span
+    span.attributes.update(attributes)
+    trace = current_trace()
+    if trace is not None:
+        trace.end_span(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _end_statement_span(context, **{"db.rowcount": cursor.rowcount})
+
+
+def _handle_error(exception_context) -> None:
+    _end_statement_span(
+        exception_context.execution_context,
+        error=type(exception_context.original_exception).__name__,
+    )
+
+
+def _build_exporter(app: Flask) -> SpanExporter:
+    exporter = app.config["TRACING_EXPORTER"]
+    if exporter == "memory":
+        return InMemorySpanExporter(app.config["TRACING_MEMORY_MAX_SPANS"])
+    if exporter == "file":
+        return FileSpanExporter(app.config["TRACING_FILE_PATH"])
+    if hasattr(exporter, "export"):
+        return exporter
+    raise ValueError(f"Unknown TRACING_EXPORTER: {exporter!r}")
+
+
+def init_tracing(app: Flask) -> Tracer | None:
+    global _engine_hooks_installed
+
+    if not app.config["TRACING_ENABLED"]:
+        return None
+
+    tracer = Tracer(_build_exporter(app), sample_rate=app.config["TRACING_SAMPLE_RATE"])
+    app.extensions["tracer"] = tracer
+
+    timing.enable_phase_tracing()
+    if not _engine_hooks_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _engine_hooks_installed = True
+
+    @app.before_request
+    def start_trace() -> None:
+        parent = parse_traceparent(request.headers.get("traceparent"))
+        g.trace_id = parent[0] if parent else _new_trace_id()
+        g.trace_parent_id = parent[1] if parent else None
+        if not tracer.should_sample(parent):
+            return
+
+        trace = RequestTrace(g.trace_id, g.trace_parent_id)
+        g.trace = trace
+        g.trace_root = trace.start_span(
+            f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+            {"http.method": request.method, "http.target": request.path},
+        )
+
+    @app.after_request
+    def record_status(response: Response) -> Response:
+        root = g.get("trace_root")
+        if root is not None:
+            root.attributes["http.status_code"] = response.status_code
+        return response
+
+    @app.teardown_request
+    def export_trace(exc: BaseException | None) -> None:
+        trace = g.pop("trace", None)
+        root = g.pop("trace_root", None)
+        if trace is None:
+            return
+        if exc is not None:
+            root.attributes["error"] = type(exc).__name__
+        trace.end_span(root)
+        tracer.exporter.export(trace.spans)
+
+    return tracer
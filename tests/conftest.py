@@ -2,6 +2,7 @@ import pytest
 
 from src import db
 from src.main import create_app
+from src.sharding import create_shard_schemas
 
 
 @pytest.fixture()
@@ -9,10 +10,49 @@ def app():
     app = create_app({
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
         "TESTING": True,
+        # Audit batches are only written on explicit flush so tests stay deterministic.
+        "AUDIT_LOG_FLUSH_INTERVAL": 60,
     })
 
     with app.app_context():
         db.create_all()
         yield app
         db.session.remove()
+        app.extensions["audit_log"].close()
         db.drop_all()
+        app.extensions["readiness"].stop()
+
+
+@pytest.fixture()
+def app_factory(tmp_path):
+    """Build apps on a file-backed SQLite database (one per app) with config overrides.
+
+    Tables, including shard schemas, are created up front; everything is dropped
+    and every engine disposed at teardown.
+    """
+    apps = []
+
+    def factory(**overrides):
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / f'app{len(apps)}.db'}",
+            "AUDIT_LOG_ENABLED": False,
+            "TESTING": True,
+            **overrides,
+        })
+        apps.append(app)
+        with app.app_context():
+            db.create_all()
+            create_shard_schemas()
+        return app
+
+    yield factory
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+        router = app.extensions.get("shard_router")
+        for engine in router.engines.values() if router is not None else ():
+            engine.dispose()
+        app.extensions["readiness"].stop()
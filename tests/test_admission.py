@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+from src.admission import AdmissionController, RouteClass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock: FakeClock | None = None) -> AdmissionController:
+    return AdmissionController(
+        [
+            RouteClass("session", 0, 2, 4, target_latency=0.1, endpoints=frozenset({"auth.me"})),
+            RouteClass("hashing", 1, 1, 3, target_latency=1.0, endpoints=frozenset({"auth.login"})),
+        ],
+        latency_window=5.0,
+        clock=clock or FakeClock(),
+    )
+
+
+def test_rejects_when_class_limit_is_reached():
+    controller = _controller()
+    hashing = controller.classes["hashing"]
+
+    assert all(controller.try_acquire(hashing) for _ in range(3))
+    assert controller.try_acquire(hashing) is False
+    assert controller.rejected == 1
+
+
+def test_sheds_lower_priority_while_higher_priority_is_congested():
+    clock = FakeClock()
+    controller = _controller(clock)
+    session, hashing = controller.classes["session"], controller.classes["hashing"]
+    controller.try_acquire(session)
+    controller.release(session, 0.5)  # session requests are running over their target
+    controller.try_acquire(session)
+
+    assert controller.try_acquire(hashing) is True
+    assert controller.try_acquire(hashing) is False
+    assert controller.try_acquire(session) is True
+
+
+def test_slow_session_request_stops_shedding_once_idle():
+    clock = FakeClock()
+    controller = _controller(clock)
+    session, hashing = controller.classes["session"], controller.classes["hashing"]
+    controller.try_acquire(session)
+    controller.release(session, 0.6)  # e.g. a cold connection
+
+    clock.now += 10  # no session traffic since, then a new one starts
+    controller.try_acquire(session)
+
+    assert [controller.try_acquire(hashing) for _ in range(4)] == [True, True, True, False]
+    controller.release(session, 0.001)
+    assert session.latency == 0.001
+
+
+def test_limit_adapts_to_observed_latency():
+    controller = _controller()
+    session = controller.classes["session"]
+
+    for _ in range(10):
+        controller.try_acquire(session)
+        controller.release(session, 0.5)
+    assert int(session.limit) == session.min_concurrency
+
+    for _ in range(50):
+        controller.try_acquire(session)
+        controller.release(session, 0.001)
+    assert int(session.limit) == session.max_concurrency
+
+
+def test_overloaded_route_fails_fast_with_retry_after(app):
+    client = app.test_client()
+    tokens = client.post(
+        "/auth/register", json={"email": "busy@example.com", "password": "StrongPass123"}
+    ).get_json()["data"]
+    hashing = app.extensions["admission"].classes["hashing"]
+    hashing.in_flight = hashing.max_concurrency
+
+    login = client.post(
+        "/auth/login", json={"email": "busy@example.com", "password": "StrongPass123"}
+    )
+    refresh = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert login.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert login.headers["Retry-After"] == "1"
+    assert login.get_json()["success"] is False
+    assert refresh.status_code == HTTPStatus.OK
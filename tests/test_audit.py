@@ -0,0 +1,60 @@
+from src import db
+from src.audit import AuditLogWriter
+from src.models import AuthEvent
+
+CREDENTIALS = {"email": "audit@example.com", "password": "StrongPass123"}
+
+
+def _events(app) -> list[AuthEvent]:
+    app.extensions["audit_log"].flush()
+    return db.session.execute(db.select(AuthEvent).order_by(AuthEvent.id)).scalars().all()
+
+
+def test_login_refresh_and_logout_are_audited(app):
+    client = app.test_client()
+    client.post("/auth/register", json=CREDENTIALS)
+
+    client.post("/auth/login", json={**CREDENTIALS, "password": "WrongPass123"})
+    login = client.post("/auth/login", json=CREDENTIALS).get_json()
+    refreshed = client.post(
+        "/auth/refresh", json={"refresh_token": login["data"]["refresh_token"]}
+    ).get_json()
+    client.post("/auth/refresh", json={"refresh_token": "invalid"})
+    client.post("/auth/logout", json={"refresh_token": refreshed["data"]["refresh_token"]})
+
+    events = _events(app)
+    user_id = login["data"]["user"]["id"]
+    assert [event.event_type for event in events] == [
+        "login_failed",
+        "login_succeeded",
+        "refresh_succeeded",
+        "refresh_failed",
+        "logout",
+    ]
+    assert events[0].email == "audit@example.com"
+    assert [event.user_id for event in events] == [user_id, user_id, user_id, None, user_id]
+    assert events[1].ip_address == "127.0.0.1"
+
+
+def test_audit_writer_batches_events(app):
+    writer = AuditLogWriter(app, max_queue_size=100, batch_size=2, flush_interval=60)
+
+    for _ in range(5):
+        assert writer.record("login_succeeded", user_id=1)
+    writer.close()
+
+    assert writer.written == 5
+    assert len(_events(app)) == 5
+    assert writer.record("login_succeeded") is False
+
+
+def test_audit_writer_drops_events_when_queue_is_full(app, monkeypatch):
+    writer = AuditLogWriter(app, max_queue_size=1, batch_size=10, flush_interval=60)
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+    assert writer.record("logout") is True
+    assert writer.record("logout") is False
+    writer.flush()
+
+    assert writer.dropped == 1
+    assert writer.written == 1
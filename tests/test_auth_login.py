@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
+import pytest
+
 from src import db
-from src.models import User
+from src.models import RefreshToken, User
 
 
 def _create_user(app, email: str = "existing@example.com", password: str = "StrongPass123") -> None:
@@ -93,3 +98,78 @@ def test_login_missing_password(app):
     assert "password" in payload["errors"]
     assert payload["message"] == "Données invalides."
 
+
+@pytest.fixture()
+def file_app(app_factory):
+    return app_factory(ADMISSION_CONTROL_ENABLED=False)
+
+
+def _concurrent_logins(app, monkeypatch, password: str, count: int = 4):
+    """Hold the first password check until ``count - 1`` duplicates are waiting on it."""
+    flights = app.extensions["login_flights"]
+    release = threading.Event()
+    checks = []
+    original_check = User.check_password
+
+    def blocking_check(self, candidate):
+        checks.append(candidate)
+        release.wait(timeout=5)
+        return original_check(self, candidate)
+
+    monkeypatch.setattr(User, "check_password", blocking_check)
+
+    def login(_):
+        return app.test_client().post(
+            "/auth/login", json={"email": "burst@example.com", "password": password}
+        )
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(login, index) for index in range(count)]
+        for _ in range(500):
+            if flights.coalesced >= count - 1:
+                break
+            time.sleep(0.01)
+        release.set()
+        responses = [future.result() for future in futures]
+
+    return responses, checks
+
+
+def test_concurrent_identical_logins_share_one_check(file_app, monkeypatch):
+    _create_user(file_app, email="burst@example.com", password="StrongPass123")
+
+    responses, checks = _concurrent_logins(file_app, monkeypatch, "StrongPass123")
+
+    assert [response.status_code for response in responses] == [HTTPStatus.OK] * 4
+    assert len(checks) == 1
+    assert file_app.extensions["login_flights"].coalesced == 3
+    refresh_tokens = {response.get_json()["data"]["refresh_token"] for response in responses}
+    assert len(refresh_tokens) == 4
+    with file_app.app_context():
+        stored = db.session.execute(db.select(RefreshToken.token)).scalars().all()
+        assert set(stored) == refresh_tokens
+    assert len(file_app.extensions["login_flights"]) == 0
+    checks = file_app.extensions["readiness"].run_probes()["checks"]
+    assert checks["login_coalescing"] == {"ok": True, "coalesced": 3, "in_flight": 0}
+
+
+def test_concurrent_identical_failed_logins_share_the_rejection(file_app, monkeypatch):
+    _create_user(file_app, email="burst@example.com", password="StrongPass123")
+
+    responses, checks = _concurrent_logins(file_app, monkeypatch, "WrongPass123")
+
+    assert [response.status_code for response in responses] == [HTTPStatus.UNAUTHORIZED] * 4
+    assert len(checks) == 1
+
+
+def test_sequential_logins_are_not_coalesced(app):
+    _create_user(app, email="again@example.com", password="StrongPass123")
+    client = app.test_client()
+
+    for _ in range(2):
+        response = client.post(
+            "/auth/login", json={"email": "again@example.com", "password": "StrongPass123"}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    assert app.extensions["login_flights"].coalesced == 0
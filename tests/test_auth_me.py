@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 from src import db
+from src.cache import RedisTTLCache
 from src.models import User
 
 
@@ -58,3 +59,126 @@ def test_me_requires_authorization_header(app):
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     payload = response.get_json()
     assert payload["msg"] == "Missing Authorization Header"
+
+
+def test_me_sets_etag_and_private_cache_headers(app):
+    client = app.test_client()
+    access_token = _register_user(client)["data"]["access_token"]
+
+    response = client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert "Authorization" in response.headers["Vary"]
+
+
+def test_me_returns_not_modified_for_matching_etag(app):
+    client = app.test_client()
+    access_token = _register_user(client)["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    etag = client.get("/auth/me", headers=headers).headers["ETag"]
+    response = client.get("/auth/me", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_me_etag_changes_when_user_is_updated(app):
+    client = app.test_client()
+    registration_payload = _register_user(client)
+    access_token = registration_payload["data"]["access_token"]
+    user_id = registration_payload["data"]["user"]["id"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    etag = client.get("/auth/me", headers=headers).headers["ETag"]
+
+    user = db.session.get(User, user_id)
+    user.email = "renamed@example.com"
+    db.session.commit()
+
+    response = client.get("/auth/me", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["data"]["user"]["email"] == "renamed@example.com"
+
+
+def test_me_etag_is_forgotten_only_once_the_update_commits(app):
+    client = app.test_client()
+    registration_payload = _register_user(client)
+    headers = {"Authorization": f"Bearer {registration_payload['data']['access_token']}"}
+    user_id = registration_payload["data"]["user"]["id"]
+    etag = client.get("/auth/me", headers=headers).headers["ETag"]
+    cache = app.extensions["auth_me_etags"]
+
+    user = db.session.get(User, user_id)
+    user.email = "renamed@example.com"
+    db.session.flush()
+    # A concurrent /auth/me still reads the committed row and re-caches the old ETag.
+    cache.set(user_id, etag.strip('"'))
+    db.session.commit()
+
+    assert cache.get(user_id) is None
+    response = client.get("/auth/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value.encode()
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_redis_etag_cache_is_shared_between_workers():
+    server = FakeRedis()
+    worker_a = RedisTTLCache(server, ttl=5, prefix="auth:me:etag:")
+    worker_b = RedisTTLCache(server, ttl=5, prefix="auth:me:etag:")
+
+    worker_a.set(1, "abc")
+    assert worker_b.get(1) == "abc"
+
+    worker_b.pop(1)
+    assert worker_a.get(1) is None
+
+
+class UnreachableRedis(FakeRedis):
+    def delete(self, key):
+        raise ConnectionError("redis is down")
+
+
+def test_redis_outage_does_not_fail_the_committing_request(app):
+    app.extensions["auth_me_etags"] = RedisTTLCache(UnreachableRedis(), ttl=5, prefix="t:")
+    client = app.test_client()
+    user_id = _register_user(client)["data"]["user"]["id"]
+
+    user = db.session.get(User, user_id)
+    user.email = "renamed@example.com"
+    db.session.commit()
+
+    assert db.session.get(User, user_id).email == "renamed@example.com"
+
+
+def test_me_uses_weak_comparison_for_if_none_match(app):
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {_register_user(client)['data']['access_token']}"}
+    etag = client.get("/auth/me", headers=headers).headers["ETag"]
+
+    cached = client.get("/auth/me", headers={**headers, "If-None-Match": f"W/{etag}"})
+    app.extensions["auth_me_etags"].clear()
+    uncached = client.get("/auth/me", headers={**headers, "If-None-Match": f"W/{etag}"})
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert uncached.status_code == HTTPStatus.NOT_MODIFIED
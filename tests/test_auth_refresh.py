@@ -6,7 +6,7 @@ from http import HTTPStatus
 from flask_jwt_extended import create_refresh_token
 
 from src import db
-from src.models import RefreshToken, User
+from src.models import AuthEvent, RefreshToken, User
 
 
 def _create_user_with_refresh_token(
@@ -103,6 +103,7 @@ def test_refresh_invalid_token(app):
 
 
 def test_refresh_with_rotated_token_fails_for_old_value(app):
+    app.config["REFRESH_TOKEN_REUSE_GRACE"] = 0
     refresh_token = _create_user_with_refresh_token(app)
     client = app.test_client()
 
@@ -146,3 +147,92 @@ def test_refresh_expired_token(app):
     assert payload["success"] is False
     assert payload["errors"]["refresh_token"] == "Refresh token invalide ou expiré."
     assert payload["message"] == "Token de rafraîchissement invalide."
+
+
+def test_refresh_reuse_within_grace_window_returns_same_successor(app):
+    refresh_token = _create_user_with_refresh_token(app)
+    client = app.test_client()
+
+    first_response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    retry_response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+    assert first_response.status_code == HTTPStatus.OK
+    assert retry_response.status_code == HTTPStatus.OK
+    assert retry_response.get_json()["data"] == first_response.get_json()["data"]
+
+    with app.app_context():
+        user = db.session.execute(
+            db.select(User).filter_by(email="refresh@example.com")
+        ).scalar_one()
+        assert len(user.refresh_tokens) == 2
+
+
+def test_refresh_reuse_within_grace_window_without_cache_reissues_access_token(app):
+    refresh_token = _create_user_with_refresh_token(app)
+    client = app.test_client()
+
+    first_payload = client.post(
+        "/auth/refresh", json={"refresh_token": refresh_token}
+    ).get_json()
+    app.extensions["refresh_grace"].clear()  # as if the retry hit another worker
+    retry_response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+    assert retry_response.status_code == HTTPStatus.OK
+    retry_data = retry_response.get_json()["data"]
+    assert retry_data["refresh_token"] == first_payload["data"]["refresh_token"]
+    assert retry_data["access_token"]
+
+
+def test_refresh_reuse_after_grace_window_revokes_token_family(app):
+    refresh_token = _create_user_with_refresh_token(app)
+    client = app.test_client()
+
+    first_payload = client.post(
+        "/auth/refresh", json={"refresh_token": refresh_token}
+    ).get_json()
+    successor = first_payload["data"]["refresh_token"]
+
+    stored = db.session.execute(
+        db.select(RefreshToken).filter_by(token=refresh_token)
+    ).scalar_one()
+    stored.revoked_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    db.session.commit()
+
+    reuse_response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    successor_response = client.post("/auth/refresh", json={"refresh_token": successor})
+
+    assert reuse_response.status_code == HTTPStatus.UNAUTHORIZED
+    assert successor_response.status_code == HTTPStatus.UNAUTHORIZED
+    tokens = db.session.execute(db.select(RefreshToken)).scalars().all()
+    assert all(token.revoked for token in tokens)
+    assert len({token.family_id for token in tokens}) == 1
+
+
+def test_refresh_grace_cache_follows_runtime_window(app):
+    app.config["REFRESH_TOKEN_REUSE_GRACE"] = 0
+    refresh_token = _create_user_with_refresh_token(app)
+    client = app.test_client()
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+    assert response.status_code == HTTPStatus.OK
+    assert app.extensions["refresh_grace"].get(refresh_token) is None
+
+
+def test_refresh_after_logout_is_not_treated_as_reuse(app):
+    refresh_token = _create_user_with_refresh_token(app)
+    client = app.test_client()
+    other_session = client.post(
+        "/auth/login", json={"email": "refresh@example.com", "password": "StrongPass123"}
+    ).get_json()["data"]["refresh_token"]
+
+    client.post("/auth/logout", json={"refresh_token": refresh_token})
+    retry_response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    other_response = client.post("/auth/refresh", json={"refresh_token": other_session})
+
+    assert retry_response.status_code == HTTPStatus.UNAUTHORIZED
+    assert other_response.status_code == HTTPStatus.OK
+    app.extensions["audit_log"].flush()
+    event_types = db.session.execute(db.select(AuthEvent.event_type)).scalars().all()
+    assert "refresh_reuse_detected" not in event_types
+    assert "refresh_failed" in event_types
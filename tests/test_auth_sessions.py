@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from src import db
+from src.models import RefreshToken, User
+
+
+def _login_with_sessions(client, count: int) -> tuple[str, list[int]]:
+    registration = client.post(
+        "/auth/register",
+        json={"email": "sessions@example.com", "password": "StrongPass123"},
+    ).get_json()
+    for _ in range(count - 1):
+        client.post(
+            "/auth/login",
+            json={"email": "sessions@example.com", "password": "StrongPass123"},
+        )
+
+    user = db.session.get(User, registration["data"]["user"]["id"])
+    token_ids = [token.id for token in user.refresh_tokens]
+    return registration["data"]["access_token"], token_ids
+
+
+def test_sessions_lists_active_tokens_with_keyset_pagination(app):
+    client = app.test_client()
+    access_token, token_ids = _login_with_sessions(client, 5)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    first_page = client.get("/auth/sessions?limit=2", headers=headers).get_json()["data"]
+    second_page = client.get(
+        f"/auth/sessions?limit=2&cursor={first_page['next_cursor']}", headers=headers
+    ).get_json()["data"]
+    third_page = client.get(
+        f"/auth/sessions?limit=2&cursor={second_page['next_cursor']}", headers=headers
+    ).get_json()["data"]
+
+    listed = [
+        session["id"]
+        for page in (first_page, second_page, third_page)
+        for session in page["sessions"]
+    ]
+    assert listed == sorted(token_ids, reverse=True)
+    assert third_page["next_cursor"] is None
+
+
+def test_sessions_excludes_revoked_and_expired_tokens(app):
+    client = app.test_client()
+    access_token, token_ids = _login_with_sessions(client, 3)
+
+    db.session.get(RefreshToken, token_ids[0]).revoked = True
+    db.session.get(RefreshToken, token_ids[1]).expires_at = datetime.now(
+        timezone.utc
+    ) - timedelta(seconds=1)
+    db.session.commit()
+
+    response = client.get(
+        "/auth/sessions", headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [session["id"] for session in response.get_json()["data"]["sessions"]] == [
+        token_ids[2]
+    ]
+
+
+def test_sessions_rejects_invalid_cursor(app):
+    client = app.test_client()
+    access_token, _ = _login_with_sessions(client, 1)
+
+    response = client.get(
+        "/auth/sessions?cursor=not-a-cursor",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.get_json()["errors"]["cursor"] == "Curseur invalide."
+
+
+def test_revoke_session_by_id(app):
+    client = app.test_client()
+    access_token, token_ids = _login_with_sessions(client, 2)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.delete(f"/auth/sessions/{token_ids[0]}", headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()["data"]["revoked"] is True
+    assert db.session.get(RefreshToken, token_ids[0]).revoked is True
+    listed = client.get("/auth/sessions", headers=headers).get_json()["data"]["sessions"]
+    assert [session["id"] for session in listed] == [token_ids[1]]
+
+
+def test_revoke_session_of_another_user_is_not_found(app):
+    client = app.test_client()
+    _, token_ids = _login_with_sessions(client, 1)
+    other = client.post(
+        "/auth/register",
+        json={"email": "other@example.com", "password": "StrongPass123"},
+    ).get_json()
+
+    response = client.delete(
+        f"/auth/sessions/{token_ids[0]}",
+        headers={"Authorization": f"Bearer {other['data']['access_token']}"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.get_json()["errors"]["session"] == "Session introuvable."
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from src import db
+from src.export import export_command
+from src.models import RefreshToken, User
+
+SERVICE_HEADERS = {"X-Service-Token": "internal-secret"}
+
+
+def _create_users(count: int) -> None:
+    for index in range(count):
+        user = User(email=f"user{index}@example.com")
+        user.set_password("StrongPass123")
+        user.refresh_tokens.append(
+            RefreshToken(
+                token=f"token-{index}",
+                expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+            )
+        )
+        db.session.add(user)
+    db.session.commit()
+
+
+def _parse(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_export_streams_users_as_ndjson(app):
+    app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    _create_users(3)
+    client = app.test_client()
+
+    response = client.get("/internal/export/users", headers=SERVICE_HEADERS)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = _parse(response.get_data(as_text=True))
+    assert [row["email"] for row in rows] == [f"user{index}@example.com" for index in range(3)]
+    assert "password_hash" not in rows[0]
+
+
+def test_export_resumes_from_keyset_cursor(app):
+    app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    _create_users(3)
+    client = app.test_client()
+
+    first_id = _parse(
+        client.get("/internal/export/refresh_tokens", headers=SERVICE_HEADERS).get_data(
+            as_text=True
+        )
+    )[0]["id"]
+    response = client.get(
+        f"/internal/export/refresh_tokens?after={first_id}", headers=SERVICE_HEADERS
+    )
+
+    rows = _parse(response.get_data(as_text=True))
+    assert len(rows) == 2
+    assert all(row["id"] > first_id for row in rows)
+    assert "token" not in rows[0]
+
+
+def test_export_rejects_malformed_cursor(app):
+    app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    _create_users(2)
+
+    response = app.test_client().get("/internal/export/users?after=abc", headers=SERVICE_HEADERS)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "after" in response.get_json()["errors"]
+
+
+def test_export_unknown_table(app):
+    app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    client = app.test_client()
+
+    response = client.get("/internal/export/secrets", headers=SERVICE_HEADERS)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_export_cli_includes_secrets_on_request(app):
+    _create_users(2)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(
+        export_command, ["refresh_tokens", "--include-secrets", "--batch-size", "1"]
+    )
+
+    assert result.exit_code == 0
+    rows = _parse(result.output)
+    assert [row["token"] for row in rows] == ["token-0", "token-1"]
@@ -6,3 +6,41 @@ def test_health():
     r = client.get("/health")
     assert r.status_code == 200
     assert r.get_json()["data"]["service"] == "umbra-auth-service"
+
+
+def test_ready_reports_dependency_checks(app):
+    client = app.test_client()
+
+    r = client.get("/ready")
+
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    assert data["status"] == "ready"
+    assert data["checks"]["database"]["ok"] is True
+    assert data["checks"]["redis"]["status"] == "disabled"
+    assert "pool" in data["checks"]
+
+
+def test_ready_serves_cached_probe_results(app):
+    client = app.test_client()
+
+    first = client.get("/ready").get_json()["data"]
+    second = client.get("/ready").get_json()["data"]
+
+    assert first["checked_at"] == second["checked_at"]
+
+
+def test_ready_returns_503_when_a_probe_fails(app):
+    def failing_probe(app):
+        raise ConnectionError("unreachable")
+
+    prober = app.extensions["readiness"]
+    prober.register("broker", failing_probe)
+    client = app.test_client()
+
+    r = client.get("/ready")
+
+    assert r.status_code == 503
+    payload = r.get_json()
+    assert payload["success"] is False
+    assert payload["data"]["checks"]["broker"] == {"ok": False, "error": "ConnectionError"}
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+
+from src import db
+from src.models import User
+
+SERVICE_HEADERS = {"X-Service-Token": "internal-secret"}
+
+
+@pytest.fixture()
+def client(app):
+    app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    app.config["INTERNAL_LOOKUP_MAX_BATCH"] = 3
+    return app.test_client()
+
+
+def _create_users(*emails: str) -> list[int]:
+    users = []
+    for email in emails:
+        user = User(email=email)
+        user.set_password("StrongPass123")
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+def test_lookup_by_ids_returns_matching_users(app, client):
+    first_id, second_id = _create_users("a@example.com", "b@example.com")
+
+    response = client.post(
+        "/internal/users/lookup",
+        json={"ids": [first_id, second_id, 999]},
+        headers=SERVICE_HEADERS,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.get_json()["data"]
+    assert sorted(user["email"] for user in data["users"]) == ["a@example.com", "b@example.com"]
+    assert data["missing"] == [999]
+
+
+def test_lookup_by_emails_with_projection(app, client):
+    _create_users("a@example.com")
+
+    response = client.post(
+        "/internal/users/lookup",
+        json={"emails": [" A@Example.com "], "fields": ["id"]},
+        headers=SERVICE_HEADERS,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.get_json()["data"]
+    assert list(data["users"][0]) == ["id"]
+    assert data["missing"] == []
+
+
+def test_lookup_rejects_oversized_batch(app, client):
+    response = client.post(
+        "/internal/users/lookup",
+        json={"ids": [1, 2, 3, 4]},
+        headers=SERVICE_HEADERS,
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.get_json()["errors"]["ids"] == "Au plus 3 éléments par requête."
+
+
+def test_lookup_rejects_unknown_fields(app, client):
+    response = client.post(
+        "/internal/users/lookup",
+        json={"ids": [1], "fields": ["password_hash"]},
+        headers=SERVICE_HEADERS,
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "fields" in response.get_json()["errors"]
+
+
+@pytest.mark.parametrize(
+    "payload, field",
+    [
+        ({"ids": [1], "fields": [{}]}, "fields"),
+        ({"ids": [2**70]}, "ids"),
+    ],
+)
+def test_lookup_rejects_malformed_values(app, client, payload, field):
+    response = client.post("/internal/users/lookup", json=payload, headers=SERVICE_HEADERS)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert field in response.get_json()["errors"]
+
+
+def test_lookup_requires_service_token(app, client):
+    response = client.post(
+        "/internal/users/lookup",
+        json={"ids": [1]},
+        headers={"X-Service-Token": "wrong"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.get_json()["success"] is False
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src import db
+
+
+@pytest.fixture()
+def timed_app(app_factory):
+    return app_factory(SERVER_TIMING_ENABLED=True)
+
+
+def _metrics(header: str) -> dict[str, str]:
+    return {metric.split(";", 1)[0]: metric for metric in header.split(", ")}
+
+
+def test_server_timing_breaks_down_register(timed_app):
+    client = timed_app.test_client()
+
+    response = client.post(
+        "/auth/register", json={"email": "timing@example.com", "password": "StrongPass123"}
+    )
+
+    metrics = _metrics(response.headers["Server-Timing"])
+    assert {"parse", "validate", "db", "hash", "jwt", "serialize", "total"} <= metrics.keys()
+    assert 'desc="' in metrics["db"]
+    assert metrics["hash"].startswith("hash;dur=")
+
+
+def test_failed_statement_is_still_timed(timed_app):
+    with timed_app.test_request_context():
+        timed_app.preprocess_request()
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM missing_table"))
+        db.session.rollback()
+        response = timed_app.process_response(timed_app.response_class())
+
+    assert 'desc="1 queries"' in _metrics(response.headers["Server-Timing"])["db"]
+
+
+def test_server_timing_is_absent_when_disabled(app):
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/register", json={"email": "timing@example.com", "password": "StrongPass123"}
+    )
+
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,182 @@
+from http import HTTPStatus
+
+import pytest
+from flask_jwt_extended import decode_token
+
+from src import db
+from src.client import ServiceTokenClient, ServiceTokenError
+from src.models import RefreshToken
+from src.service_clients import create_service_client, derive_client_secret_key
+
+
+@pytest.fixture()
+def service_client(app):
+    _, secret = create_service_client("billing", ["users:read", "users:export"])
+    return "billing", secret
+
+
+def test_client_credentials_grant_issues_scoped_access_token(app, service_client):
+    client_id, secret = service_client
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/token",
+        json={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": secret,
+            "scope": "users:read",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.get_json()["data"]
+    assert data["token_type"] == "Bearer"
+    assert data["scope"] == "users:read"
+    assert data["expires_in"] == 900
+    assert "refresh_token" not in data
+    claims = decode_token(data["access_token"])
+    assert claims["client_id"] == "billing"
+    assert db.session.execute(db.select(RefreshToken)).first() is None
+
+
+def test_client_credentials_accepts_http_basic(app, service_client):
+    client_id, secret = service_client
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/token",
+        data={"grant_type": "client_credentials"},
+        auth=(client_id, secret),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()["data"]["scope"] == "users:export users:read"
+
+
+def test_client_credentials_treats_empty_scope_as_missing(app, service_client):
+    client_id, secret = service_client
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/token",
+        json={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": secret,
+            "scope": " ",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()["data"]["scope"] == "users:export users:read"
+
+
+def test_client_credentials_rejects_bad_secret(app, service_client):
+    client_id, _ = service_client
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/token",
+        json={"grant_type": "client_credentials", "client_id": client_id, "client_secret": "x"},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.get_json()["errors"]["client"] == "Client invalide."
+
+
+def test_client_credentials_rejects_unknown_scope(app, service_client):
+    client_id, secret = service_client
+    client = app.test_client()
+
+    response = client.post(
+        "/auth/token",
+        json={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": secret,
+            "scope": "users:write",
+        },
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "scope" in response.get_json()["errors"]
+
+
+def test_client_secret_key_is_separate_from_jwt_key(app):
+    assert app.config["SERVICE_CLIENT_SECRET_KEY"] != app.config["JWT_SECRET_KEY"]
+    assert app.config["SERVICE_CLIENT_SECRET_KEY"] == derive_client_secret_key(
+        app.config["JWT_SECRET_KEY"]
+    )
+
+
+def test_service_token_authorizes_internal_api_by_scope(app):
+    _, secret = create_service_client("reader", ["users:read"])
+    client = app.test_client()
+    token = client.post(
+        "/auth/token",
+        json={"grant_type": "client_credentials", "client_id": "reader", "client_secret": secret},
+    ).get_json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    lookup = client.post("/internal/users/lookup", json={"ids": [1]}, headers=headers)
+    export = client.get("/internal/export/users", headers=headers)
+
+    assert lookup.status_code == HTTPStatus.OK
+    assert export.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_token_client_caches_until_renewal_window(app, service_client):
+    client_id, secret = service_client
+    http = app.test_client()
+    calls = []
+    now = [1_000.0]
+
+    def transport(url, payload):
+        calls.append(payload)
+        response = http.post(url, json=payload)
+        return response.status_code, response.get_json()
+
+    token_client = ServiceTokenClient(
+        "/auth/token", client_id, secret, transport=transport, clock=lambda: now[0]
+    )
+
+    first = token_client.get_token()
+    now[0] += 800
+    assert token_client.get_token() == first
+    assert len(calls) == 1
+
+    now[0] += 80  # inside the 30 second renewal window before the 900 second expiry
+    token_client.get_token()
+    assert len(calls) == 2
+
+
+def test_token_client_raises_on_refusal(app):
+    http = app.test_client()
+
+    def transport(url, payload):
+        response = http.post(url, json=payload)
+        return response.status_code, response.get_json()
+
+    token_client = ServiceTokenClient("/auth/token", "ghost", "secret", transport=transport)
+
+    with pytest.raises(ServiceTokenError):
+        token_client.get_token()
+
+
+def test_service_tokens_are_refused_on_user_endpoints(app, service_client):
+    client_id, secret = service_client
+    client = app.test_client()
+    access_token = client.post(
+        "/auth/token",
+        json={"grant_type": "client_credentials", "client_id": client_id, "client_secret": secret},
+    ).get_json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    for response in (
+        client.get("/auth/sessions", headers=headers),
+        client.delete("/auth/sessions/1", headers=headers),
+        client.get("/auth/me", headers=headers),
+    ):
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert response.get_json()["errors"]["token"] == "Jeton utilisateur requis."
@@ -0,0 +1,252 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+import sqlalchemy as sa
+
+from src import db, sharding
+from src.export import export_command
+from src.health import shard_probe
+from src.models import RefreshToken, User
+from src.sharding import bucket_for_email, move_bucket
+
+CREDENTIALS = {"email": "shard@example.com", "password": "StrongPass123"}
+
+
+@pytest.fixture()
+def sharded_app(app_factory, tmp_path):
+    return app_factory(
+        AUTH_SHARDS={
+            "shard_a": f"sqlite:///{tmp_path / 'shard_a.db'}",
+            "shard_b": f"sqlite:///{tmp_path / 'shard_b.db'}",
+        },
+        AUTH_SHARD_BUCKETS=16,
+        AUTH_SHARD_MAP_FILE=str(tmp_path / "shard-map.json"),
+    )
+
+
+def _count_users(app, shard: str) -> int:
+    with app.extensions["shard_router"].engines[shard].connect() as connection:
+        return connection.execute(
+            db.select(db.func.count()).select_from(User.__table__)
+        ).scalar()
+
+
+def _owning_shard(app) -> str:
+    router = app.extensions["shard_router"]
+    return router.shard_for_email(CREDENTIALS["email"])
+
+
+def test_bucket_for_email_is_stable():
+    assert bucket_for_email("shard@example.com", 16) == bucket_for_email("shard@example.com", 16)
+    assert 0 <= bucket_for_email("shard@example.com", 16) < 16
+
+
+def test_register_writes_user_to_owning_shard_only(sharded_app):
+    client = sharded_app.test_client()
+
+    payload = client.post("/auth/register", json=CREDENTIALS).get_json()
+
+    owner = _owning_shard(sharded_app)
+    other = "shard_b" if owner == "shard_a" else "shard_a"
+    assert _count_users(sharded_app, owner) == 1
+    assert _count_users(sharded_app, other) == 0
+    router = sharded_app.extensions["shard_router"]
+    assert router.shard_for_user_id(payload["data"]["user"]["id"]) == owner
+
+
+def test_token_endpoints_route_without_scatter_gather(sharded_app):
+    client = sharded_app.test_client()
+    registration = client.post("/auth/register", json=CREDENTIALS).get_json()
+
+    login = client.post("/auth/login", json=CREDENTIALS)
+    refreshed = client.post(
+        "/auth/refresh", json={"refresh_token": registration["data"]["refresh_token"]}
+    )
+    me = client.get(
+        "/auth/me",
+        headers={"Authorization": f"Bearer {refreshed.get_json()['data']['access_token']}"},
+    )
+    logout = client.post(
+        "/auth/logout", json={"refresh_token": refreshed.get_json()["data"]["refresh_token"]}
+    )
+
+    assert login.status_code == HTTPStatus.OK
+    assert refreshed.status_code == HTTPStatus.OK
+    assert me.get_json()["data"]["user"]["email"] == CREDENTIALS["email"]
+    assert logout.status_code == HTTPStatus.OK
+    assert client.post("/auth/refresh", json={"refresh_token": "invalid"}).status_code == (
+        HTTPStatus.UNAUTHORIZED
+    )
+
+
+def test_move_bucket_rebalances_users_and_tokens(sharded_app):
+    client = sharded_app.test_client()
+    registration = client.post("/auth/register", json=CREDENTIALS).get_json()
+    source = _owning_shard(sharded_app)
+    target = "shard_b" if source == "shard_a" else "shard_a"
+    bucket = bucket_for_email(CREDENTIALS["email"], 16)
+
+    with sharded_app.app_context():
+        assert move_bucket(bucket, target, settle=0) == 1
+
+    assert _owning_shard(sharded_app) == target
+    assert _count_users(sharded_app, source) == 0
+    assert _count_users(sharded_app, target) == 1
+
+    refreshed = client.post(
+        "/auth/refresh", json={"refresh_token": registration["data"]["refresh_token"]}
+    )
+    assert refreshed.status_code == HTTPStatus.OK
+    assert refreshed.get_json()["data"]["user"]["id"] == registration["data"]["user"]["id"]
+
+    with sharded_app.extensions["shard_router"].engines[target].connect() as connection:
+        tokens = connection.execute(db.select(RefreshToken.__table__)).all()
+    assert len(tokens) == 2
+
+
+def test_internal_lookup_groups_ids_by_shard(sharded_app):
+    sharded_app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    client = sharded_app.test_client()
+    ids = [
+        client.post(
+            "/auth/register",
+            json={"email": f"user{index}@example.com", "password": "StrongPass123"},
+        ).get_json()["data"]["user"]["id"]
+        for index in range(6)
+    ]
+
+    response = client.post(
+        "/internal/users/lookup",
+        json={"ids": ids},
+        headers={"X-Service-Token": "internal-secret"},
+    )
+
+    data = response.get_json()["data"]
+    assert sorted(user["id"] for user in data["users"]) == sorted(ids)
+    assert data["missing"] == []
+
+
+def test_frozen_bucket_rejects_requests_until_assigned(sharded_app):
+    client = sharded_app.test_client()
+    client.post("/auth/register", json=CREDENTIALS)
+    router = sharded_app.extensions["shard_router"]
+    bucket = bucket_for_email(CREDENTIALS["email"], 16)
+
+    router.freeze(bucket)
+    frozen = client.post("/auth/login", json=CREDENTIALS)
+    router.assign(bucket, _owning_shard(sharded_app))
+
+    assert frozen.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert frozen.headers["Retry-After"] == "5"
+    assert client.post("/auth/login", json=CREDENTIALS).status_code == HTTPStatus.OK
+
+
+def test_move_bucket_recopies_rows_written_to_source_during_the_move(sharded_app, monkeypatch):
+    client = sharded_app.test_client()
+    registration = client.post("/auth/register", json=CREDENTIALS).get_json()
+    router = sharded_app.extensions["shard_router"]
+    source = _owning_shard(sharded_app)
+    target = "shard_b" if source == "shard_a" else "shard_a"
+    bucket = bucket_for_email(CREDENTIALS["email"], 16)
+    waits = []
+
+    def straggler_write(seconds):
+        waits.append(seconds)
+        if len(waits) == 2:  # after the reroute, a request routed earlier still commits
+            with router.engines[source].begin() as connection:
+                connection.execute(
+                    RefreshToken.__table__.insert(),
+                    {
+                        "user_id": registration["data"]["user"]["id"],
+                        "token": "late-token",
+                        "expires_at": datetime.now(timezone.utc),
+                    },
+                )
+
+    monkeypatch.setattr(sharding.time, "sleep", straggler_write)
+    with sharded_app.app_context():
+        move_bucket(bucket, target)
+
+    with router.engines[target].connect() as connection:
+        tokens = connection.execute(db.select(RefreshToken.__table__.c.token)).scalars().all()
+    assert "late-token" in tokens
+    assert _count_users(sharded_app, source) == 0
+
+
+def test_move_bucket_requires_a_shared_map_file(sharded_app):
+    sharded_app.extensions["shard_router"].map_file = None
+
+    with sharded_app.app_context(), pytest.raises(RuntimeError):
+        move_bucket(0, "shard_b", settle=0)
+
+
+def test_export_requires_a_shard_when_sharded(sharded_app):
+    sharded_app.config["INTERNAL_SERVICE_TOKEN"] = "internal-secret"
+    client = sharded_app.test_client()
+    client.post("/auth/register", json=CREDENTIALS)
+    headers = {"X-Service-Token": "internal-secret"}
+
+    missing = client.get("/internal/export/users", headers=headers)
+    owned = client.get(f"/internal/export/users?shard={_owning_shard(sharded_app)}", headers=headers)
+    cli = sharded_app.test_cli_runner().invoke(export_command, ["users"])
+
+    assert missing.status_code == HTTPStatus.BAD_REQUEST
+    assert "shard" in missing.get_json()["errors"]
+    assert CREDENTIALS["email"] in owned.get_data(as_text=True)
+    assert cli.exit_code != 0
+    assert "--shard" in cli.output
+
+
+def test_ready_probes_every_shard(sharded_app):
+    prober = sharded_app.extensions["readiness"]
+
+    healthy = prober.run_probes()
+    unreachable = sa.create_engine("sqlite:////nonexistent/dir/shard_b.db")
+    prober.register("shard:shard_b", shard_probe(unreachable))
+    broken = prober.run_probes()
+    unreachable.dispose()
+
+    assert healthy["checks"]["shard:shard_a"]["ok"] is True
+    assert healthy["checks"]["shard:shard_b"]["ok"] is True
+    assert broken["ready"] is False
+    assert broken["checks"]["shard:shard_b"]["ok"] is False
+
+
+def test_sqlite_shards_get_embedded_pool_options(sharded_app):
+    for engine in sharded_app.extensions["shard_router"].engines.values():
+        assert engine.pool.size() == sharded_app.config["SQLITE_POOL_SIZE"]
+
+
+def test_move_bucket_carries_revocations_made_on_source_during_the_move(sharded_app, monkeypatch):
+    client = sharded_app.test_client()
+    registration = client.post("/auth/register", json=CREDENTIALS).get_json()
+    refresh_token = registration["data"]["refresh_token"]
+    router = sharded_app.extensions["shard_router"]
+    source = _owning_shard(sharded_app)
+    target = "shard_b" if source == "shard_a" else "shard_a"
+    waits = []
+
+    def straggler_logout(seconds):
+        waits.append(seconds)
+        if len(waits) == 2:  # a logout routed before the freeze commits on the source
+            with router.engines[source].begin() as connection:
+                connection.execute(
+                    RefreshToken.__table__.update()
+                    .where(RefreshToken.__table__.c.token == refresh_token)
+                    .values(revoked=True, revoked_at=datetime.now(timezone.utc))
+                )
+
+    monkeypatch.setattr(sharding.time, "sleep", straggler_logout)
+    with sharded_app.app_context():
+        move_bucket(bucket_for_email(CREDENTIALS["email"], 16), target)
+
+    with router.engines[target].connect() as connection:
+        revoked = connection.execute(
+            db.select(RefreshToken.__table__.c.revoked).where(
+                RefreshToken.__table__.c.token == refresh_token
+            )
+        ).scalar_one()
+    assert revoked
+    refreshed = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert refreshed.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from src import db
+from src.embedded import is_sqlite_file
+
+
+@pytest.fixture()
+def embedded_app(app_factory):
+    return app_factory()
+
+
+def test_is_sqlite_file():
+    assert is_sqlite_file("sqlite:///umbra-auth.db")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert not is_sqlite_file("sqlite://")
+    assert not is_sqlite_file("postgresql://user@localhost/auth")
+
+
+def test_embedded_mode_applies_pragmas(embedded_app):
+    with embedded_app.app_context(), db.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == -32 * 1024
+        assert db.engine.pool.size() == 8
+
+
+def test_concurrent_refreshes_commit_without_lock_errors(embedded_app):
+    client = embedded_app.test_client()
+    refresh_tokens = [
+        client.post(
+            "/auth/register",
+            json={"email": f"edge{index}@example.com", "password": "StrongPass123"},
+        ).get_json()["data"]["refresh_token"]
+        for index in range(4)
+    ]
+
+    def refresh_chain(token: str) -> list[int]:
+        statuses = []
+        thread_client = embedded_app.test_client()
+        for _ in range(5):
+            response = thread_client.post("/auth/refresh", json={"refresh_token": token})
+            statuses.append(response.status_code)
+            token = response.get_json()["data"]["refresh_token"]
+        return statuses
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(refresh_chain, refresh_tokens))
+
+    assert all(status == HTTPStatus.OK for statuses in results for status in statuses)
+
+
+def test_single_writer_gives_up_after_busy_timeout(app_factory):
+    app = app_factory(SQLITE_PRAGMAS={"journal_mode": "WAL", "busy_timeout": 100})
+    with app.app_context():
+        engine = db.engine
+
+    insert = text("INSERT INTO auth_events (event_type, created_at) VALUES ('probe', '2026-01-01')")
+    with engine.connect() as holder, engine.connect() as waiter:
+        holder.execute(insert)  # keeps the write open without committing
+        with pytest.raises(OperationalError, match="database is locked"):
+            waiter.execute(insert)
+        holder.rollback()
+
+
+def test_single_writer_releases_after_sqlite_commit(embedded_app):
+    with embedded_app.app_context():
+        engine = db.engine
+    open_transactions = []
+
+    @event.listens_for(engine, "commit")
+    def record_transaction_state(conn):  # runs after the single writer's listener
+        open_transactions.append(conn.connection.dbapi_connection.in_transaction)
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(
+                text("INSERT INTO auth_events (event_type, created_at) VALUES ('probe', '2026-01-01')")
+            )
+            connection.commit()
+    finally:
+        event.remove(engine, "commit", record_transaction_state)
+
+    assert open_transactions == [False]
+
+
+def test_embedded_mode_can_be_disabled(app_factory):
+    app = app_factory(SQLITE_EMBEDDED_MODE=False)
+
+    with app.app_context(), db.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src import db
+from src.tracing import (
+    RequestTrace,
+    current_traceparent,
+    format_traceparent,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture()
+def traced_app(app_factory):
+    return app_factory(TRACING_ENABLED=True, TRACING_SAMPLE_RATE=0.0)
+
+
+def _register(client, **headers):
+    return client.post(
+        "/auth/register",
+        json={"email": "trace@example.com", "password": "StrongPass123"},
+        headers=headers,
+    )
+
+
+def test_traceparent_round_trip():
+    header = format_traceparent(TRACE_ID, PARENT_ID, True)
+
+    assert header == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    assert parse_traceparent(header) == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+
+
+def test_sampled_request_records_spans_under_incoming_trace(traced_app):
+    client = traced_app.test_client()
+
+    response = _register(client, traceparent=format_traceparent(TRACE_ID, PARENT_ID, True))
+
+    assert response.status_code == 201
+    spans = traced_app.extensions["tracer"].exporter.spans
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span.name, []).append(span)
+
+    root = by_name["POST /auth/register"][0]
+    assert root.parent_id == PARENT_ID
+    assert root.attributes["http.status_code"] == 201
+    assert {"validate", "hash", "jwt", "db.query"} <= by_name.keys()
+    assert all(span.trace_id == TRACE_ID for span in spans)
+    assert all(span.end_time_ns is not None for span in spans)
+    assert by_name["hash"][0].parent_id == root.span_id
+    assert any("INSERT" in span.attributes["db.statement"] for span in by_name["db.query"])
+
+
+def test_failed_statement_closes_its_span(traced_app):
+    with traced_app.test_request_context():
+        trace = g.trace = RequestTrace(TRACE_ID, None)
+        root = g.trace_root = trace.start_span("request")
+
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM missing_table"))
+        db.session.rollback()
+        after = trace.start_span("after")
+
+    failed = next(span for span in trace.spans if span.name == "db.query")
+    assert failed.end_time_ns is not None
+    assert failed.attributes["error"] == "OperationalError"
+    assert after.parent_id == root.span_id
+
+
+def test_current_traceparent_propagates_incoming_trace(traced_app):
+    incoming = format_traceparent(TRACE_ID, PARENT_ID, True)
+    with traced_app.test_request_context(headers={"traceparent": incoming}):
+        traced_app.preprocess_request()
+        span = g.trace.start_span("outgoing-call")
+
+        assert current_traceparent() == format_traceparent(TRACE_ID, span.span_id, True)
+        g.trace.end_span(span)
+        assert current_traceparent() == format_traceparent(TRACE_ID, g.trace_root.span_id, True)
+
+    unsampled = format_traceparent(TRACE_ID, PARENT_ID, False)
+    with traced_app.test_request_context(headers={"traceparent": unsampled}):
+        traced_app.preprocess_request()
+
+        assert current_traceparent() == unsampled
+
+
+def test_unsampled_requests_record_nothing(traced_app):
+    client = traced_app.test_client()
+
+    _register(client, traceparent=format_traceparent(TRACE_ID, PARENT_ID, False))
+    client.get("/health")
+
+    assert not traced_app.extensions["tracer"].exporter.spans
+
+
+def test_memory_exporter_keeps_only_recent_spans(app_factory):
+    app = app_factory(TRACING_ENABLED=True, TRACING_SAMPLE_RATE=1.0, TRACING_MEMORY_MAX_SPANS=3)
+    client = app.test_client()
+
+    for _ in range(5):
+        client.get("/health")
+
+    assert len(app.extensions["tracer"].exporter.spans) == 3
+
+
+def test_sample_rate_applies_to_root_requests(app_factory):
+    app = app_factory(TRACING_ENABLED=True, TRACING_SAMPLE_RATE=1.0)
+
+    app.test_client().get("/health")
+
+    spans = list(app.extensions["tracer"].exporter.spans)
+    assert [span.name for span in spans] == ["GET /health"]
+    assert spans[0].parent_id is None
+
+
+def test_file_exporter_writes_json_lines(app_factory, tmp_path):
+    path = tmp_path / "spans.jsonl"
+    app = app_factory(TRACING_ENABLED=True, TRACING_EXPORTER="file", TRACING_FILE_PATH=str(path))
+
+    _register(app.test_client(), traceparent=format_traceparent(TRACE_ID, PARENT_ID, True))
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records
+    assert {record["trace_id"] for record in records} == {TRACE_ID}
+    assert "POST /auth/register" in {record["name"] for record in records}